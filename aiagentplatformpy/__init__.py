@@ -1,12 +1,32 @@
-# 导出主要的类和类型
-from .auth import TokenAuth, AppAkskAuth
-from .aiagentplatform import AiAgentPlatform, AsyncAiAgentPlatform
-from .chat import ChatEventType
+# 导出主要的类和类型（按需懒加载，首次访问时才导入对应子模块）
+import importlib
 
-__all__ = [
+_LAZY = {
+    'TokenAuth': ('aiagentplatformpy.auth', 'TokenAuth'),
+    'AppAkskAuth': ('aiagentplatformpy.auth', 'AppAkskAuth'),
+    'AiAgentPlatform': ('aiagentplatformpy.aiagentplatform', 'AiAgentPlatform'),
+    'AsyncAiAgentPlatform': ('aiagentplatformpy.aiagentplatform', 'AsyncAiAgentPlatform'),
+    'ChatEventType': ('aiagentplatformpy.chat', 'ChatEventType'),
+}
+
+__all__ = (
     'TokenAuth',
     'AppAkskAuth',
     'AiAgentPlatform',
     'AsyncAiAgentPlatform',
-    'ChatEventType'
-]
+    'ChatEventType',
+)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module, attr = _LAZY[name]
+        value = getattr(importlib.import_module(module), attr)
+        # cache on the module so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
@@ -1,47 +1,61 @@
-from typing import TYPE_CHECKING, Optional
+from __future__ import annotations
 
-from aiagentplatformpy.auth import Auth
-from aiagentplatformpy.config import AiAgentPlatform_COM_BASE_URL
-from aiagentplatformpy.request import Requester
-from aiagentplatformpy.util import remove_url_trailing_slash
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
+    from aiagentplatformpy.auth import Auth
+
     from .chat import AsyncChatClient, ChatClient
     from .conversations import AsyncConversationsClient, ConversationsClient
     # from .knowledge import AsyncKnowledgeClient, KnowledgeClient
 
 
-class AiAgentPlatform(object):
+class _PlatformBase(object):
+    """
+    Wiring shared by the sync and async platform clients: auth, base url and the requester
+    whose connection pools every sub client reuses.
+    """
+
     def __init__(
         self,
         auth: Auth,
-        base_url: str = AiAgentPlatform_COM_BASE_URL,
-        # http_client: Optional[SyncHTTPClient] = None,
+        base_url: Optional[str] = None,
     ):
+        from aiagentplatformpy.request import Requester
+
+        if base_url is None:
+            from aiagentplatformpy.config import AiAgentPlatform_COM_BASE_URL as base_url
+
         self._auth = auth
-        self._base_url = remove_url_trailing_slash(base_url)
+        self._base_url = base_url.rstrip("/")
         self._requester = Requester(auth=auth)
 
-        # service client
-        self._conversations: Optional[ConversationsClient] = None
-        self._chat: Optional[ChatClient] = None
-        # self._knowledge: Optional[KnowledgeClient] = None  # deprecated
 
-    @property
+class AiAgentPlatform(_PlatformBase):
+    def __enter__(self) -> AiAgentPlatform:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the http connection pool shared by all sub clients.
+        """
+        self._requester.close()
+
+    @cached_property
     def conversations(self) -> "ConversationsClient":
-        if not self._conversations:
-            from .conversations import ConversationsClient
+        from .conversations import ConversationsClient
 
-            self._conversations = ConversationsClient(self._base_url, self._auth, self._requester)
-        return self._conversations
+        return ConversationsClient(self._base_url, self._auth, self._requester)
 
-    @property
+    @cached_property
     def chat(self) -> "ChatClient":
-        if not self._chat:
-            from aiagentplatformpy.chat import ChatClient
+        from aiagentplatformpy.chat import ChatClient
 
-            self._chat = ChatClient(self._base_url, self._auth, self._requester)
-        return self._chat
+        return ChatClient(self._base_url, self._auth, self._requester)
 
     # @property
     # def knowledge(self) -> "KnowledgeClient":
@@ -58,37 +72,30 @@ class AiAgentPlatform(object):
     #     return self._knowledge
 
 
-class AsyncAiAgentPlatform(object):
-    def __init__(
-        self,
-        auth: Auth,
-        base_url: str = AiAgentPlatform_COM_BASE_URL,
-        # http_client: Optional[AsyncHTTPClient] = None,
-    ):
-        self._auth = auth
-        self._base_url = remove_url_trailing_slash(base_url)
-        self._requester = Requester(auth=auth)
+class AsyncAiAgentPlatform(_PlatformBase):
+    async def __aenter__(self) -> AsyncAiAgentPlatform:
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
 
-        # service client
-        self._chat: Optional[AsyncChatClient] = None
-        self._conversations: Optional[AsyncConversationsClient] = None
-        # self._knowledge: Optional[AsyncKnowledgeClient] = None  # deprecated
+    async def close(self) -> None:
+        """
+        Close the http connection pools shared by all sub clients.
+        """
+        await self._requester.aclose()
 
-    @property
+    @cached_property
     def chat(self) -> "AsyncChatClient":
-        if not self._chat:
-            from aiagentplatformpy.chat import AsyncChatClient
+        from aiagentplatformpy.chat import AsyncChatClient
 
-            self._chat = AsyncChatClient(self._base_url, self._auth, self._requester)
-        return self._chat
+        return AsyncChatClient(self._base_url, self._auth, self._requester)
 
-    @property
+    @cached_property
     def conversations(self) -> "AsyncConversationsClient":
-        if not self._conversations:
-            from .conversations import AsyncConversationsClient
+        from .conversations import AsyncConversationsClient
 
-            self._conversations = AsyncConversationsClient(self._base_url, self._auth, self._requester)
-        return self._conversations
+        return AsyncConversationsClient(self._base_url, self._auth, self._requester)
 
     # @property
     # def knowledge(self) -> "AsyncKnowledgeClient":
@@ -6,7 +6,7 @@ import hmac
 import json
 import time
 import urllib
-from typing import List, Optional
+from typing import List, Optional, Union
 from urllib.parse import quote_plus, urlparse
 
 from authlib.jose import jwt  # type: ignore
@@ -841,9 +841,10 @@ class AppAkskAuth(Auth):
     def sk(self) -> str:
         return self._sk
 
-    def ak_sk_sign(self, method, host, uri, headers: dict, body: dict) -> None:
+    def ak_sk_sign(self, method, host, uri, headers: dict, body: Union[dict, str, None]) -> None:
         signer = Signer(self.ak, self.sk)
-        signer.sign(method, host, uri, headers, json.dumps(body))
+        # a str body is the serialized request body and is signed exactly as it is sent
+        signer.sign(method, host, uri, headers, body if isinstance(body, str) else json.dumps(body))
 
 
 class JWTAuth(Auth):
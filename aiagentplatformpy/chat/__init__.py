@@ -1,9 +1,10 @@
+import asyncio
 import contextlib
-import json
 from enum import Enum
-from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Union, overload
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-import aiohttp
+import orjson
+from pydantic import TypeAdapter
 
 from aiagentplatformpy.auth import Auth
 from aiagentplatformpy.model import AsyncIteratorHTTPResponse, AsyncStream, AiAgentPlatformModel, IteratorHTTPResponse, ListResponse, Stream
@@ -128,17 +129,21 @@ class MessageObjectString(AiAgentPlatformModel):
         return MessageObjectString(type=MessageObjectStringType.AUDIO, file_id=file_id, file_url=file_url)
 
 
+_MESSAGE_OBJECTS_ADAPTER = TypeAdapter(List[MessageObjectString])
+
+
 class Message(AiAgentPlatformModel):
     # The entity that sent this message.
-    # role: MessageRole
+    role: Optional[MessageRole] = None
     # The type of message.
-    # type: MessageType = MessageType.UNKNOWN
+    type: Optional[MessageType] = None
     # The content of the message. It supports various types of content, including plain text, multimodal (a mix of text, images, and files), message cards, and more.
     # 消息的内容，支持纯文本、多模态（文本、图片、文件混合输入）、卡片等多种类型的内容。
-    # content: str
+    # Optional because chat responses are validated into this model too and carry the answer instead.
+    content: Optional[str] = None
     # The type of message content.
     # 消息内容的类型
-    # content_type: MessageContentType
+    content_type: Optional[MessageContentType] = None
     # Additional information when creating a message, and this additional information will also be returned when retrieving messages.
     # Custom key-value pairs should be specified in Map object format, with a length of 16 key-value pairs. The length of the key should be between 1 and 64 characters, and the length of the value should be between 1 and 512 characters.
     # 创建消息时的附加消息，获取消息时也会返回此附加消息。
@@ -173,7 +178,8 @@ class Message(AiAgentPlatformModel):
         return Message(
             role=MessageRole.USER,
             type=MessageType.QUESTION,
-            content=json.dumps([obj.model_dump() for obj in objects]),
+            # the whole list is serialized by pydantic-core in one call, without intermediate dicts
+            content=_MESSAGE_OBJECTS_ADAPTER.dump_json(objects).decode(),
             content_type=MessageContentType.OBJECT_STRING,
             meta_data=meta_data,
         )
@@ -189,6 +195,16 @@ class Message(AiAgentPlatformModel):
         )
 
 
+def _dump_query_extend(messages: List[Message]) -> List[dict]:
+    """
+    Dump the query_extend messages to json-ready dicts, the http clients cannot encode pydantic models.
+    """
+    for message in messages:
+        if message.content is None:
+            raise ValueError("query_extend messages must have content, build them with the Message.build_* helpers")
+    return [message.model_dump(mode="json", exclude_unset=True) for message in messages]
+
+
 class ChatStatus(str, Enum):
     """
     The running status of the session
@@ -346,53 +362,106 @@ class ChatEventType(str, Enum):
     DONE = "message_end"
 
 
-class ChatEvent(AiAgentPlatformModel):
-    # logid: str
-    event: str
-    chat: Optional[Chat] = None
-    message: Optional[Message] = None
-    knowledge: Optional[Knowledge] = None
+class ChatEvent(object):
+    """
+    An event of the chat stream, a plain container created for every frame.
+    """
+
+    __slots__ = ("event", "chat", "message", "knowledge", "_raw_response")
+
+    def __init__(
+        self,
+        event: str,
+        chat: Optional[Chat] = None,
+        message: Optional[Message] = None,
+        knowledge: Optional[Knowledge] = None,
+        raw_response=None,
+    ):
+        self.event = event
+        self.chat = chat
+        self.message = message
+        self.knowledge = knowledge
+        self._raw_response = raw_response
+
+    @property
+    def logid(self) -> str:
+        if self._raw_response is None:
+            return ""
+        return self._raw_response.headers.get("x-tt-logid")
+
+    def __repr__(self) -> str:
+        return (
+            f"ChatEvent(event={self.event!r}, chat={self.chat!r}, message={self.message!r}, "
+            f"knowledge={self.knowledge!r})"
+        )
 
 
-def _chat_stream_handler(data: Dict, raw_response, is_async: bool = False) -> ChatEvent:
-    event = data["event"]
-    event_data = data["data:data"]
-    _event = json.loads(event_data)['event']
-    if _event == ChatEventType.ERROR:
+# plain str values of the events checked on every frame, compared without going through the Enum
+_ERROR_EVENT = ChatEventType.ERROR.value
+_DONE_EVENT = ChatEventType.DONE.value
+
+_new_chat_event = object.__new__
+_validate_message = Message.model_validate
+_validate_chat = Chat.model_validate
+_validate_knowledge = Knowledge.model_validate
+
+
+# one constructor per event category, the slots are assigned directly instead of going through the
+# keyword arguments and defaults of ChatEvent.__init__
+def _message_event(event: str, parsed: Dict, raw_response) -> ChatEvent:
+    e = _new_chat_event(ChatEvent)
+    e.event = event
+    e.chat = None
+    e.message = _validate_message(parsed)
+    e.knowledge = None
+    e._raw_response = raw_response
+    return e
+
+
+def _chat_event(event: str, parsed: Dict, raw_response) -> ChatEvent:
+    e = _new_chat_event(ChatEvent)
+    e.event = event
+    e.chat = _validate_chat(parsed)
+    e.message = None
+    e.knowledge = None
+    e._raw_response = raw_response
+    return e
+
+
+def _knowledge_event(event: str, parsed: Dict, raw_response) -> ChatEvent:
+    e = _new_chat_event(ChatEvent)
+    e.event = event
+    e.chat = None
+    e.message = None
+    e.knowledge = _validate_knowledge(parsed)
+    e._raw_response = raw_response
+    return e
+
+
+# event -> constructor of its ChatEvent, built once so each frame is dispatched by one dict lookup
+_HANDLERS = {
+    ChatEventType.CONVERSATION_CHAT_IN_MESSAGE.value: _message_event,
+    ChatEventType.DONE.value: _message_event,
+    ChatEventType.CONVERSATION_CHAT_START.value: _chat_event,
+    ChatEventType.CONVERSATION_CHAT_OUTPUT_START.value: _chat_event,
+    ChatEventType.CONVERSATION_MESSAGE_COST.value: _chat_event,
+    ChatEventType.CONVERSATION_CHAT_OUTPUT_END.value: _chat_event,
+    ChatEventType.CONVERSATION_KNOWLEDGE_RETRIEVE.value: _knowledge_event,
+    ChatEventType.CONVERSATION_KNOWLEDGE_RETRIEVE_END.value: _knowledge_event,
+}
+
+
+def _chat_stream_handler(event: str, event_data: str, raw_response) -> ChatEvent:
+    # parse the frame once, the dict is used both for dispatch and for model validation
+    parsed = orjson.loads(event_data)
+    _event = parsed['event']
+    if _event == _ERROR_EVENT:
         raise Exception(f"error event: {event_data}")  # TODO: error struct format
-    elif _event in [
-        ChatEventType.CONVERSATION_CHAT_IN_MESSAGE,
-        ChatEventType.DONE
-    ]:
-        event = ChatEvent(event=_event, message=Message.model_validate_json(event_data))
-        event._raw_response = raw_response
-        return event
-    elif _event in [
-        ChatEventType.CONVERSATION_CHAT_START,
-        ChatEventType.CONVERSATION_CHAT_OUTPUT_START,
-        ChatEventType.CONVERSATION_MESSAGE_COST,
-        ChatEventType.CONVERSATION_CHAT_OUTPUT_END
-    ]:
-        event = ChatEvent(event=_event, chat=Chat.model_validate_json(event_data))
-        event._raw_response = raw_response
-        return event
-    elif _event in [ChatEventType.CONVERSATION_KNOWLEDGE_RETRIEVE_END, ChatEventType.CONVERSATION_KNOWLEDGE_RETRIEVE]:
-        event = ChatEvent(event=_event, knowledge=Knowledge.model_validate_json(event_data))
-        event._raw_response = raw_response
-        return event
-    else:
-        event = ChatEvent(event=_event)
-        event._raw_response = raw_response
-        return event
-        #raise ValueError(f"invalid chat.event: {_event}, {data}")
-
-
-def _sync_chat_stream_handler(data: Dict, raw_response) -> ChatEvent:
-    return _chat_stream_handler(data, raw_response=raw_response, is_async=False)
-
-
-def _async_chat_stream_handler(data: Dict, raw_response) -> ChatEvent:
-    return _chat_stream_handler(data, raw_response=raw_response, is_async=True)
+    make_event = _HANDLERS.get(_event)
+    if make_event is None:
+        return ChatEvent(_event, raw_response=raw_response)
+        #raise ValueError(f"invalid chat.event: {_event}, {event_data}")
+    return make_event(_event, parsed, raw_response)
 
 
 class ToolOutput(AiAgentPlatformModel):
@@ -410,6 +479,9 @@ class ChatClient(object):
         self._auth = auth
         self._requester = requester
         self._messages: Optional[ChatMessagesClient] = None
+        # endpoint urls are fixed per client, build them once instead of on every call
+        self._chat_url = f"{self._base_url}/api/proxy/api/v1/chat_query"
+        self._cancel_url = f"{self._base_url}/v3/chat/cancel"
 
     def create(
         self,
@@ -418,7 +490,7 @@ class ChatClient(object):
         conversation_id: Optional[str] = None,
         query: str,
         query_extend: Optional[List[Message]] = None
-    ) -> Chat:
+    ) -> Optional[Message]:
         """
         Call the Chat API with non-streaming to send messages to a published AiAgentPlatform bot.
 
@@ -431,18 +503,15 @@ class ChatClient(object):
         :param query: question
         :param query_extend: Additional information for the conversation. You can pass the user's query for this
         conversation through this field. The array length is limited to 100, meaning up to 100 messages can be input.
-        :return: chat object
+        :return: the final message of the chat
         """
-        res = self._create(
+        return self._create(
             user_id=user_id,
             stream=False,
             query=query,
             query_extend=query_extend,
             conversation_id=conversation_id,
         )
-        for i in res:
-            if i.event == ChatEventType.DONE:
-                return i.message
 
     @contextlib.contextmanager
     def stream(
@@ -469,7 +538,7 @@ class ChatClient(object):
         conversation through this field. The array length is limited to 100, meaning up to 100 messages can be input.
         :return: iterator of ChatEvent
         """
-        yield self._create(
+        stream = self._create(
             user_id=user_id,
             stream=True,
             query=query,
@@ -478,83 +547,11 @@ class ChatClient(object):
             headers={'Accept': 'text/event-stream'},
             **kwargs,
         )
-
-    # def create_and_poll(
-    #     self,
-    #     *,
-    #     bot_id: str,
-    #     user_id: str,
-    #     conversation_id: Optional[str] = None,
-    #     additional_messages: Optional[List[Message]] = None,
-    #     custom_variables: Optional[Dict[str, str]] = None,
-    #     auto_save_history: bool = True,
-    #     meta_data: Optional[Dict[str, str]] = None,
-    #     poll_timeout: Optional[int] = None,
-    # ) -> ChatPoll:
-    #     """
-    #     Call the Chat API with non-streaming to send messages to a published AiAgentPlatform bot and
-    #     fetch chat status & message.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/chat_v3
-    #     docs zh: https://www.coze.cn/docs/developer_guides/chat_v3
-    #
-    #     :param bot_id: The ID of the bot that the API interacts with.
-    #     :param user_id: The user who calls the API to chat with the bot.
-    #     This parameter is defined, generated, and maintained by the user within their business system.
-    #     :param conversation_id: Indicate which conversation the chat is taking place in.
-    #     :param additional_messages: Additional information for the conversation. You can pass the user's query for this
-    #     conversation through this field. The array length is limited to 100, meaning up to 100 messages can be input.
-    #     :param custom_variables: The customized variable in a key-value pair.
-    #     :param auto_save_history: Whether to automatically save the history of conversation records.
-    #     :param meta_data: Additional information, typically used to encapsulate some business-related fields.
-    #     :param poll_timeout: poll timeout in seconds
-    #     :return: chat object
-    #     """
-    #     chat = self.create(
-    #         bot_id=bot_id,
-    #         user_id=user_id,
-    #         conversation_id=conversation_id,
-    #         additional_messages=additional_messages,
-    #         custom_variables=custom_variables,
-    #         auto_save_history=auto_save_history,
-    #         meta_data=meta_data,
-    #     )
-    #
-    #     start = int(time.time())
-    #     interval = 1
-    #     while chat.status == ChatStatus.IN_PROGRESS:
-    #         if poll_timeout is not None and int(time.time()) - start > poll_timeout:
-    #             # too long, cancel chat
-    #             self.cancel(conversation_id=chat.conversation_id, chat_id=chat.id)
-    #             return ChatPoll(chat=chat)
-    #
-    #         time.sleep(interval)
-    #         chat = self.retrieve(conversation_id=chat.conversation_id, chat_id=chat.id)
-    #
-    #     messages = self.messages.list(conversation_id=chat.conversation_id, chat_id=chat.id)
-    #     return ChatPoll(chat=chat, messages=messages)
-
-    @overload
-    def _create(
-        self,
-        *,
-        user_id: str,
-        conversation_id: Optional[str] = None,
-        stream: bool,
-        query: str,
-        query_extend: Optional[List[Message]] = None,
-    ) -> Stream[ChatEvent]: ...
-
-    @overload
-    def _create(
-        self,
-        *,
-        user_id: str,
-        conversation_id: Optional[str] = None,
-        stream: bool,
-        query: str,
-        query_extend: Optional[List[Message]] = None,
-    ) -> Chat: ...
+        try:
+            yield stream
+        finally:
+            # give the connection back to the pool, also when the caller stops before the last event
+            stream._raw_response.close()
 
     def _create(
         self,
@@ -565,12 +562,12 @@ class ChatClient(object):
         query: str,
         query_extend: Optional[List[Message]] = None,
         **kwargs,
-    ) -> Union[Chat, Stream[ChatEvent]]:
+    ) -> Union[Optional[Message], Stream[ChatEvent]]:
         """
         Create a conversation.
         Conversation is an interaction between a bot and a user, including one or more messages.
         """
-        url = f"{self._base_url}/api/proxy/api/v1/chat_query"
+        url = self._chat_url
         body = {
             "AppConversationID": conversation_id,
             "UserID": user_id,
@@ -578,18 +575,25 @@ class ChatClient(object):
             "ResponseMode": "streaming" if stream else "blocking",
         }
         if query_extend:
-            body['QueryExtends'] = query_extend
+            body['QueryExtends'] = _dump_query_extend(query_extend)
         headers: Optional[dict] = kwargs.get("headers")
         if not stream:
             resp = self._requester.request(
                 "post",
                 url,
                 False,
-                Chat,
+                Message,
                 headers=headers,
                 body=body,
             )
-            return Stream(resp._raw_response, resp.data, fields=["event", "data:data"], handler=_sync_chat_stream_handler)
+            if not isinstance(resp, IteratorHTTPResponse):
+                # a json answer is already the final message
+                return Message.model_validate(resp) if resp is not None else None
+            # the blocking mode may still be answered with sse, only the final message is kept
+            for event in Stream(resp._raw_response, resp.data, fields=["event", "data:data"], handler=_chat_stream_handler):
+                if event.event == _DONE_EVENT:
+                    return event.message
+            return None
 
         response: IteratorHTTPResponse[str] = self._requester.request(
             "post",
@@ -603,81 +607,9 @@ class ChatClient(object):
             response._raw_response,
             response.data,
             fields=["event", "data:data"],
-            handler=_sync_chat_stream_handler,
+            handler=_chat_stream_handler,
         )
 
-    # def retrieve(
-    #     self,
-    #     *,
-    #     conversation_id: str,
-    #     chat_id: str,
-    # ) -> Chat:
-    #     """
-    #     Get the detailed information of the chat.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/retrieve_chat
-    #     docs zh: https://www.coze.cn/docs/developer_guides/retrieve_chat
-    #
-    #     :param conversation_id: The ID of the conversation.
-    #     :param chat_id: The ID of the chat.
-    #     :return: chat object
-    #     """
-    #     url = f"{self._base_url}/v3/chat/retrieve"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #         "chat_id": chat_id,
-    #     }
-    #     return self._requester.request("post", url, False, Chat, params=params)
-
-    # def submit_tool_outputs(
-    #     self, *, conversation_id: str, chat_id: str, tool_outputs: List[ToolOutput], stream: bool
-    # ) -> Union[Chat, Stream[ChatEvent]]:
-    #     """
-    #     Call this API to submit the results of tool execution.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/chat_submit_tool_outputs
-    #     docs zh: https://www.coze.cn/docs/developer_guides/chat_submit_tool_outputs
-    #
-    #     :param conversation_id: The Conversation ID can be viewed in the 'conversation_id' field of the Response when
-    #     initiating a conversation through the Chat API.
-    #     :param chat_id: The Chat ID can be viewed in the 'id' field of the Response when initiating a chat through the
-    #     Chat API. If it is a streaming response, check the 'id' field in the chat event of the Response.
-    #     :param tool_outputs: The execution result of the tool. For detailed instructions, refer to the ToolOutput Object
-    #     :param stream: Whether to enable streaming response.
-    #     true: Fill in the context of the previous conversation and continue with streaming response.
-    #     false: (Default) Non-streaming response, only reply with basic information of the conversation.
-    #     :return:
-    #     """
-    #     url = f"{self._base_url}/v3/chat/submit_tool_outputs"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #         "chat_id": chat_id,
-    #     }
-    #     body = {
-    #         "tool_outputs": [i.model_dump() for i in tool_outputs],
-    #         "stream": stream,
-    #     }
-    #
-    #     if not stream:
-    #         return self._requester.request(
-    #             "post",
-    #             url,
-    #             False,
-    #             Chat,
-    #             params=params,
-    #             body=body,
-    #         )
-    #
-    #     resp: IteratorHTTPResponse[str] = self._requester.request(
-    #         "post",
-    #         url,
-    #         True,
-    #         None,
-    #         params=params,
-    #         body=body,
-    #     )
-    #     return Stream(resp._raw_response, resp.data, fields=["event", "data"], handler=_sync_chat_stream_handler)
-
     def cancel(
         self,
         *,
@@ -696,23 +628,13 @@ class ChatClient(object):
         Chat API. If it is a streaming response, check the 'id' field in the chat event of the Response.
         :return:
         """
-        url = f"{self._base_url}/v3/chat/cancel"
+        url = self._cancel_url
         body = {
             "conversation_id": conversation_id,
             "chat_id": chat_id,
         }
         return self._requester.request("post", url, False, Chat, body=body)
 
-    # @property
-    # def messages(
-    #     self,
-    # ) -> "ChatMessagesClient":
-    #     if self._messages is None:
-    #         from .message import ChatMessagesClient
-    #
-    #         self._messages = ChatMessagesClient(self._base_url, self._auth, self._requester)
-    #     return self._messages
-
 
 class AsyncChatClient(object):
     def __init__(self, base_url: str, auth: Auth, requester: Requester):
@@ -720,6 +642,11 @@ class AsyncChatClient(object):
         self._auth = auth
         self._requester = requester
         self._messages: Optional[AsyncChatMessagesClient] = None
+        # (user_id, conversation_id, query) -> task of the non-streaming chat already running for it
+        self._inflight: Dict[Tuple[str, Optional[str], str], "asyncio.Task"] = {}
+        # endpoint urls are fixed per client, build them once instead of on every call
+        self._chat_url = f"{self._base_url}/api/proxy/api/v1/chat_query"
+        self._cancel_url = f"{self._base_url}/v3/chat/cancel"
 
     async def create(
         self,
@@ -728,7 +655,7 @@ class AsyncChatClient(object):
         conversation_id: Optional[str] = None,
         query: str,
         query_extend: Optional[List[Message]] = None
-    ) -> Chat:
+    ) -> Optional[Message]:
         """
         Call the Chat API with non-streaming to send messages to a published AiAgentPlatform bot.
 
@@ -741,26 +668,34 @@ class AsyncChatClient(object):
         :param query: question
         :param query_extend: Additional information for the conversation. You can pass the user's query for this
         conversation through this field. The array length is limited to 100, meaning up to 100 messages can be input.
-        :return: chat object
+        :return: the final message of the chat
         """
-        try:
-            self._requester.a_session = aiohttp.ClientSession()
-            res = await self._create(
+        # the requester keeps one pooled aiohttp session, closed by AsyncAiAgentPlatform.close()
+        if query_extend:
+            return await self._create(
                 user_id=user_id,
                 stream=False,
                 query=query,
                 query_extend=query_extend,
                 conversation_id=conversation_id,
             )
-            async for i in res:
-                if i.event == ChatEventType.DONE:
-                    return i.message
-        finally:
-            try:
-                if self._requester.a_session:
-                    await self._requester.a_session.close()
-            except:
-                pass
+
+        # identical chats asked concurrently share the request that is already in flight
+        key = (user_id, conversation_id, query)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._create(
+                    user_id=user_id,
+                    stream=False,
+                    query=query,
+                    conversation_id=conversation_id,
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield the shared task, a caller that is cancelled must not cancel it for the others
+        return await asyncio.shield(task)
 
     @contextlib.asynccontextmanager
     async def stream(
@@ -787,49 +722,21 @@ class AsyncChatClient(object):
         conversation through this field. The array length is limited to 100, meaning up to 100 messages can be input.
         :return: iterator of ChatEvent
         """
-        # session = aiohttp.ClientSession()
+        # the requester keeps one pooled aiohttp session, closed by AsyncAiAgentPlatform.close()
+        stream = await self._create(
+            user_id=user_id,
+            stream=True,
+            query=query,
+            query_extend=query_extend,
+            conversation_id=conversation_id,
+            headers={'Accept': 'text/event-stream'},
+            **kwargs,
+        )
         try:
-            self._requester.a_session = aiohttp.ClientSession()
-            yield await self._create(
-                user_id=user_id,
-                stream=True,
-                query=query,
-                query_extend=query_extend,
-                conversation_id=conversation_id,
-                headers={'Accept': 'text/event-stream'},
-                **kwargs,
-            )
-        except:
-            pass
+            yield stream
         finally:
-            try:
-                if self._requester.a_session:
-                    await self._requester.a_session.close()
-            except:
-                pass
-
-
-    @overload
-    async def _create(
-        self,
-        *,
-        user_id: str,
-        conversation_id: Optional[str] = None,
-        stream: bool,
-        query: str,
-        query_extend: Optional[List[Message]] = None,
-    ) -> AsyncStream[ChatEvent]: ...
-
-    @overload
-    async def _create(
-        self,
-        *,
-        user_id: str,
-        conversation_id: Optional[str] = None,
-        stream: bool,
-        query: str,
-        query_extend: Optional[List[Message]] = None,
-    ) -> Chat: ...
+            # give the connection back to the pool, also when the caller stops before the last event
+            stream._raw_response.release()
 
     async def _create(
         self,
@@ -840,12 +747,12 @@ class AsyncChatClient(object):
         query: str,
         query_extend: Optional[List[Message]] = None,
         **kwargs,
-    ) -> Union[Chat, AsyncStream[ChatEvent]]:
+    ) -> Union[Optional[Message], AsyncStream[ChatEvent]]:
         """
         Create a conversation.
         Conversation is an interaction between a bot and a user, including one or more messages.
         """
-        url = f"{self._base_url}/api/proxy/api/v1/chat_query"
+        url = self._chat_url
         body = {
             "AppConversationID": conversation_id,
             "UserID": user_id,
@@ -853,18 +760,30 @@ class AsyncChatClient(object):
             "ResponseMode": "streaming" if stream else "blocking",
         }
         if query_extend:
-            body['QueryExtends'] = query_extend
+            body['QueryExtends'] = _dump_query_extend(query_extend)
         headers: Optional[dict] = kwargs.get("headers")
         if not stream:
             resp = await self._requester.arequest(
                 "post",
                 url,
                 False,
-                Chat,
+                Message,
                 headers=headers,
                 body=body
             )
-            return AsyncStream(resp.data, fields=["event", "data:data"], handler=_async_chat_stream_handler, raw_response=resp._raw_response)
+            if not isinstance(resp, AsyncIteratorHTTPResponse):
+                # a json answer is already the final message
+                return Message.model_validate(resp) if resp is not None else None
+            # the blocking mode may still be answered with sse, only the final message is kept
+            try:
+                async for event in AsyncStream(
+                    resp.data, fields=["event", "data:data"], handler=_chat_stream_handler, raw_response=resp._raw_response
+                ):
+                    if event.event == _DONE_EVENT:
+                        return event.message
+                return None
+            finally:
+                resp._raw_response.release()
 
         resp: AsyncIteratorHTTPResponse[str] = await self._requester.arequest(
             "post",
@@ -876,114 +795,9 @@ class AsyncChatClient(object):
         )
 
         return AsyncStream(
-            resp.data, fields=["event", "data:data"], handler=_async_chat_stream_handler, raw_response=resp._raw_response
+            resp.data, fields=["event", "data:data"], handler=_chat_stream_handler, raw_response=resp._raw_response
         )
 
-    # async def retrieve(
-    #     self,
-    #     *,
-    #     conversation_id: str,
-    #     chat_id: str,
-    # ) -> Chat:
-    #     """
-    #     Get the detailed information of the chat.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/retrieve_chat
-    #     docs zh: https://www.coze.cn/docs/developer_guides/retrieve_chat
-    #
-    #     :param conversation_id: The ID of the conversation.
-    #     :param chat_id: The ID of the chat.
-    #     :return: chat object
-    #     """
-    #     url = f"{self._base_url}/v3/chat/retrieve"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #         "chat_id": chat_id,
-    #     }
-    #     return await self._requester.arequest("post", url, False, Chat, params=params)
-    #
-    # async def submit_tool_outputs(self, *, conversation_id: str, chat_id: str, tool_outputs: List[ToolOutput]) -> Chat:
-    #     """
-    #     Call this API to submit the results of tool execution.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/chat_submit_tool_outputs
-    #     docs zh: https://www.coze.cn/docs/developer_guides/chat_submit_tool_outputs
-    #
-    #     :param conversation_id: The Conversation ID can be viewed in the 'conversation_id' field of the Response when
-    #     initiating a conversation through the Chat API.
-    #     :param chat_id: The Chat ID can be viewed in the 'id' field of the Response when initiating a chat through the
-    #     Chat API. If it is a streaming response, check the 'id' field in the chat event of the Response.
-    #     :param tool_outputs: The execution result of the tool. For detailed instructions, refer to the ToolOutput Object
-    #     true: Fill in the context of the previous conversation and continue with streaming response.
-    #     false: (Default) Non-streaming response, only reply with basic information of the conversation.
-    #     :return:
-    #     """
-    #
-    #     return await self._submit_tool_outputs(
-    #         conversation_id=conversation_id, chat_id=chat_id, stream=False, tool_outputs=tool_outputs
-    #     )
-    #
-    # async def submit_tool_outputs_stream(
-    #     self,
-    #     *,
-    #     conversation_id: str,
-    #     chat_id: str,
-    #     tool_outputs: List[ToolOutput],
-    # ) -> AsyncIterator[ChatEvent]:
-    #     """
-    #     Call this API to submit the results of tool execution.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/chat_submit_tool_outputs
-    #     docs zh: https://www.coze.cn/docs/developer_guides/chat_submit_tool_outputs
-    #
-    #     :param conversation_id: The Conversation ID can be viewed in the 'conversation_id' field of the Response when
-    #     initiating a conversation through the Chat API.
-    #     :param chat_id: The Chat ID can be viewed in the 'id' field of the Response when initiating a chat through the
-    #     Chat API. If it is a streaming response, check the 'id' field in the chat event of the Response.
-    #     :param tool_outputs: The execution result of the tool. For detailed instructions, refer to the ToolOutput Object
-    #     true: Fill in the context of the previous conversation and continue with streaming response.
-    #     false: (Default) Non-streaming response, only reply with basic information of the conversation.
-    #     :return:
-    #     """
-    #
-    #     async for item in await self._submit_tool_outputs(
-    #         conversation_id=conversation_id, chat_id=chat_id, stream=True, tool_outputs=tool_outputs
-    #     ):
-    #         yield item
-
-    # @overload
-    # async def _submit_tool_outputs(
-    #     self, *, conversation_id: str, chat_id: str, stream: Literal[True], tool_outputs: List[ToolOutput]
-    # ) -> AsyncStream[ChatEvent]: ...
-    #
-    # @overload
-    # async def _submit_tool_outputs(
-    #     self, *, conversation_id: str, chat_id: str, stream: Literal[False], tool_outputs: List[ToolOutput]
-    # ) -> Chat: ...
-    #
-    # async def _submit_tool_outputs(
-    #     self, *, conversation_id: str, chat_id: str, stream: Literal[True, False], tool_outputs: List[ToolOutput]
-    # ) -> Union[Chat, AsyncStream[ChatEvent]]:
-    #     url = f"{self._base_url}/v3/chat/submit_tool_outputs"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #         "chat_id": chat_id,
-    #     }
-    #     body = {
-    #         "tool_outputs": [i.model_dump() for i in tool_outputs],
-    #         "stream": stream,
-    #     }
-    #
-    #     if not stream:
-    #         return await self._requester.arequest("post", url, False, Chat, params=params, body=body)
-    #
-    #     resp: AsyncIteratorHTTPResponse[str] = await self._requester.arequest(
-    #         "post", url, True, None, params=params, body=body
-    #     )
-    #     return AsyncStream(
-    #         resp.data, fields=["event", "data"], handler=_async_chat_stream_handler, raw_response=resp._raw_response
-    #     )
-
     async def cancel(
         self,
         *,
@@ -1002,19 +816,9 @@ class AsyncChatClient(object):
         Chat API. If it is a streaming response, check the 'id' field in the chat event of the Response.
         :return:
         """
-        url = f"{self._base_url}/v3/chat/cancel"
+        url = self._cancel_url
         body = {
             "conversation_id": conversation_id,
             "chat_id": chat_id,
         }
         return await self._requester.arequest("post", url, False, Chat, body=body)
-
-    # @property
-    # def messages(
-    #     self,
-    # ) -> "AsyncChatMessagesClient":
-    #     if self._messages is None:
-    #         from .message import AsyncChatMessagesClient
-    #
-    #         self._messages = AsyncChatMessagesClient(self._base_url, self._auth, self._requester)
-    #     return self._messages
@@ -8,3 +8,14 @@ AiAgentPlatform_COM_BASE_URL = "https://opensseapi.sit.cmft.com"
 # DEFAULT_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
 # DEFAULT_CONNECTION_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
 DEFAULT_TIMEOUT = 600
+
+# requests/aiohttp speak HTTP/1.1 only, so concurrent calls are served by a pool of keep-alive connections
+DEFAULT_MAX_CONNECTIONS = 200
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_EXPIRY = 60
+# seconds the aiohttp connector caches resolved hosts
+DEFAULT_DNS_CACHE_TTL = 300
+# read buffer of the aiohttp session, large sse frames (verbose answers) must fit in it
+DEFAULT_READ_BUFSIZE = 10 * 1024 * 1024
+# max bytes taken from the socket per read of a sync sse stream, a chunked response yields earlier
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
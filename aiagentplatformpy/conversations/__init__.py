@@ -1,7 +1,7 @@
 from typing import Any, Dict, List, Optional
 
 from aiagentplatformpy.auth import Auth
-from aiagentplatformpy.model import AsyncNumberPaged, AiAgentPlatformModel, HTTPRequest, NumberPaged
+from aiagentplatformpy.model import AiAgentPlatformModel
 from aiagentplatformpy.request import Requester
 from aiagentplatformpy.util import remove_url_trailing_slash
 
@@ -39,6 +39,9 @@ class ConversationsClient(object):
         self._auth = auth
         self._requester = requester
         self._messages = None
+        # endpoint urls are fixed per client, build them once instead of on every call
+        self._create_url = f"{self._base_url}/api/proxy/api/v1/create_conversation"
+        self._update_url = f"{self._base_url}/api/proxy/api/v1/update_conversation"
 
     def create(
         self,
@@ -53,14 +56,13 @@ class ConversationsClient(object):
         returned when retrieving messages.
         :return: Conversation object
         """
-        url = f"{self._base_url}/api/proxy/api/v1/create_conversation"
         body: Dict[str, Any] = {
             "Inputs": inputs,
             "UserID": user_id,
         }
         if app_key:
             body["AppKey"] = app_key
-        return self._requester.request("post", url, False, Conversation, body=body)
+        return self._requester.request("post", self._create_url, False, Conversation, body=body)
 
     def update(
         self,
@@ -76,7 +78,6 @@ class ConversationsClient(object):
         returned when retrieving messages.
         :return: Conversation object
         """
-        url = f"{self._base_url}/api/proxy/api/v1/update_conversation"
         body: Dict[str, Any] = {
             "AppConversationID": conversation_id,
             "Inputs": inputs,
@@ -84,65 +85,7 @@ class ConversationsClient(object):
         }
         if app_key:
             body["AppKey"] = app_key
-        return self._requester.request("post", url, False, Conversation, body=body)
-
-    # def list(
-    #     self,
-    #     *,
-    #     app_key: str,
-    #     page_num: int = 1,
-    #     page_size: int = 50,
-    # ):
-    #     url = f"{self._base_url}/v1/conversations"
-    #
-    #     def request_maker(i_page_num: int, i_page_size: int) -> HTTPRequest:
-    #         return self._requester.make_request(
-    #             "GET",
-    #             url,
-    #             params={
-    #                 "AppKey": app_key,
-    #                 "page_num": i_page_num,
-    #                 "page_size": i_page_size,
-    #             },
-    #             cast=_PrivateListConversationResp,
-    #             is_async=False,
-    #             stream=False,
-    #         )
-    #
-    #     return NumberPaged(
-    #         page_num=page_num,
-    #         page_size=page_size,
-    #         requestor=self._requester,
-    #         request_maker=request_maker,
-    #     )
-    #
-    # def retrieve(self, *, conversation_id: str) -> Conversation:
-    #     """
-    #     Get the information of specific conversation.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/retrieve_conversation
-    #     docs cn: https://www.coze.cn/docs/developer_guides/retrieve_conversation
-    #
-    #     :param conversation_id: The ID of the conversation.
-    #     :return: Conversation object
-    #     """
-    #     url = f"{self._base_url}/v1/conversation/retrieve"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #     }
-    #     return self._requester.request("get", url, False, Conversation, params=params)
-    #
-    # def clear(self, *, conversation_id: str) -> Section:
-    #     url = f"{self._base_url}/v1/conversations/{conversation_id}/clear"
-    #     return self._requester.request("post", url, False, Section)
-    #
-    # @property
-    # def messages(self):
-    #     if not self._messages:
-    #         from .message import MessagesClient
-    #
-    #         self._messages = MessagesClient(self._base_url, self._auth, self._requester)
-    #     return self._messages
+        return self._requester.request("post", self._update_url, False, Conversation, body=body)
 
 
 class AsyncConversationsClient(object):
@@ -151,6 +94,9 @@ class AsyncConversationsClient(object):
         self._auth = auth
         self._requester = requester
         self._messages = None
+        # endpoint urls are fixed per client, build them once instead of on every call
+        self._create_url = f"{self._base_url}/api/proxy/api/v1/create_conversation"
+        self._update_url = f"{self._base_url}/api/proxy/api/v1/update_conversation"
 
     async def create(
         self,
@@ -165,14 +111,13 @@ class AsyncConversationsClient(object):
         returned when retrieving messages.
         :return: Conversation object
         """
-        url = f"{self._base_url}/api/proxy/api/v1/create_conversation"
         body: Dict[str, Any] = {
             "Inputs": inputs,
             "UserID": user_id,
         }
         if app_key:
             body["AppKey"] = app_key
-        return self._requester.request("post", url, False, Conversation, body=body)
+        return self._requester.request("post", self._create_url, False, Conversation, body=body)
     async def update(
         self,
         *,
@@ -187,7 +132,6 @@ class AsyncConversationsClient(object):
         returned when retrieving messages.
         :return: Conversation object
         """
-        url = f"{self._base_url}/api/proxy/api/v1/update_conversation"
         body: Dict[str, Any] = {
             "AppConversationID": conversation_id,
             "Inputs": inputs,
@@ -195,62 +139,4 @@ class AsyncConversationsClient(object):
         }
         if app_key:
             body["AppKey"] = app_key
-        return self._requester.request("post", url, False, Conversation, body=body)
-
-    # async def list(
-    #     self,
-    #     *,
-    #     app_key: str,
-    #     page_num: int = 1,
-    #     page_size: int = 50,
-    # ):
-    #     url = f"{self._base_url}/v1/conversations"
-    #
-    #     def request_maker(i_page_num: int, i_page_size: int) -> HTTPRequest:
-    #         return self._requester.make_request(
-    #             "GET",
-    #             url,
-    #             params={
-    #                 "AppKey": app_key,
-    #                 "page_num": i_page_num,
-    #                 "page_size": i_page_size,
-    #             },
-    #             cast=_PrivateListConversationResp,
-    #             is_async=False,
-    #             stream=False,
-    #         )
-    #
-    #     return await AsyncNumberPaged.build(
-    #         page_num=page_num,
-    #         page_size=page_size,
-    #         requestor=self._requester,
-    #         request_maker=request_maker,
-    #     )
-    #
-    # async def retrieve(self, *, conversation_id: str) -> Conversation:
-    #     """
-    #     Get the information of specific conversation.
-    #
-    #     docs en: https://www.coze.com/docs/developer_guides/retrieve_conversation
-    #     docs cn: https://www.coze.cn/docs/developer_guides/retrieve_conversation
-    #
-    #     :param conversation_id: The ID of the conversation.
-    #     :return: Conversation object
-    #     """
-    #     url = f"{self._base_url}/v1/conversation/retrieve"
-    #     params = {
-    #         "conversation_id": conversation_id,
-    #     }
-    #     return await self._requester.arequest("get", url, False, Conversation, params=params)
-    #
-    # async def clear(self, *, conversation_id: str) -> Section:
-    #     url = f"{self._base_url}/v1/conversations/{conversation_id}/clear"
-    #     return await self._requester.arequest("post", url, False, Section)
-    #
-    # @property
-    # def messages(self):
-    #     if not self._messages:
-    #         from .message import AsyncMessagesClient
-    #
-    #         self._messages = AsyncMessagesClient(self._base_url, self._auth, self._requester)
-    #     return self._messages
+        return self._requester.request("post", self._update_url, False, Conversation, body=body)
@@ -5,7 +5,6 @@ from typing import (
     Any,
     AsyncIterator,
     Callable,
-    Dict,
     Generic,
     Iterable,
     Iterator,
@@ -134,6 +133,8 @@ class HTTPRequest(AiAgentPlatformModel, Generic[T]):
     params: Optional[dict] = None
     headers: Optional[dict] = None
     json_body: Optional[dict] = None
+    # json body already serialized by the requester, sent as is
+    content: Optional[bytes] = None
     files: Optional[dict] = None
     is_async: Optional[bool] = None
     stream: bool = False
@@ -563,24 +564,25 @@ class Stream(Generic[T], HTTPResponse):
         raw_response,
         iters: Iterator[str],
         fields: List[str],
-        handler: Callable[[Dict[str, str]], T],
+        handler: Callable[..., T],
     ):
         super().__init__(raw_response)
         self._iters = iters
         self._fields = fields
+        # called as handler(*values of fields in order, raw_response), no dict is built per event
         self._handler = handler
 
     def __iter__(self):
         return self
 
     def __next__(self) -> T:
-        return self._handler(self._extra_event(), self._raw_response)
+        return self._handler(*self._extra_event(), self._raw_response)
 
-    def _extra_event(self) -> Dict[str, str]:
-        data = dict(map(lambda x: (x, ""), self._fields))
+    def _extra_event(self) -> List[str]:
+        values = [""] * len(self._fields)
         times = 0
 
-        while times < len(data):
+        while times < len(values):
             line = next(self._iters).strip()
             line = line.decode('utf-8')
             if line == "":
@@ -590,16 +592,16 @@ class Stream(Generic[T], HTTPResponse):
 
             # log_debug("receive event, logid=%s, event=%s", self.logid, line)
 
-            field, value = self._extra_field_data(line, data)
-            data[field] = value
+            index, value = self._extra_field_data(line, values)
+            values[index] = value
             times += 1
-        return data
+        return values
 
-    def _extra_field_data(self, line: str, data: Dict[str, str]) -> Tuple[str, str]:
-        for field in self._fields:
+    def _extra_field_data(self, line: str, values: List[str]) -> Tuple[int, str]:
+        for index, field in enumerate(self._fields):
             if line.startswith(field + ":"):
-                if data[field] == "":
-                    return field, line[len(field) + 1 :].strip()
+                if values[index] == "":
+                    return index, line[len(field) + 1 :].strip()
                 else:
                     raise AiAgentPlatformInvalidEventError(field, line, self.logid)
         raise AiAgentPlatformInvalidEventError("", line, self.logid)
@@ -610,12 +612,13 @@ class AsyncStream(Generic[T], HTTPResponse):
         self,
         iters: AsyncIterator[str],
         fields: List[str],
-        handler: Callable[[Dict[str, str]], T],
+        handler: Callable[..., T],
         raw_response,
     ):
         super().__init__(raw_response)
         self._iters = iters
         self._fields = fields
+        # called as handler(*values of fields in order, raw_response), no dict is built per event
         self._handler = handler
         self._iterator = self.__stream__()
 
@@ -627,7 +630,7 @@ class AsyncStream(Generic[T], HTTPResponse):
         return await self._iterator.__anext__()
 
     async def __stream__(self) -> AsyncIterator[T]:
-        data = self._make_data()
+        values = self._make_data()
         times = 0
 
         buffer = ""
@@ -641,26 +644,26 @@ class AsyncStream(Generic[T], HTTPResponse):
 
             # log_debug("async receive event, logid=%s, event=%s", self.logid, line)
 
-            field, value = self._extra_field_data(line, data)
-            data[field] = value
+            index, value = self._extra_field_data(line, values)
+            values[index] = value
             times += 1
 
             if times >= len(self._fields):
                 try:
-                    yield self._handler(data, self._raw_response)
+                    yield self._handler(*values, self._raw_response)
                 except StopAsyncIteration:
                     return
-                data = self._make_data()
+                values = self._make_data()
                 times = 0
 
-    def _extra_field_data(self, line: str, data: Dict[str, str]) -> Tuple[str, str]:
-        for field in self._fields:
+    def _extra_field_data(self, line: str, values: List[str]) -> Tuple[int, str]:
+        for index, field in enumerate(self._fields):
             if line.startswith(field + ":"):
-                if data[field] == "":
-                    return field, line[len(field) + 1 :].strip()
+                if values[index] == "":
+                    return index, line[len(field) + 1 :].strip()
                 else:
                     raise AiAgentPlatformInvalidEventError(field, line, self.logid)
         raise AiAgentPlatformInvalidEventError("", line, self.logid)
 
-    def _make_data(self):
-        return dict(map(lambda x: (x, ""), self._fields))
+    def _make_data(self) -> List[str]:
+        return [""] * len(self._fields)
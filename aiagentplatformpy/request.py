@@ -1,10 +1,15 @@
+import asyncio
+from functools import lru_cache
 from urllib.parse import urlparse
 
-import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
+    Dict,
     List,
     Optional,
     Tuple,
@@ -14,10 +19,17 @@ from typing import (
     overload,
 )
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing_extensions import Literal, get_args
 
-# from aiagentplatformpy.config import DEFAULT_CONNECTION_LIMITS, DEFAULT_TIMEOUT
+from aiagentplatformpy.config import (
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_READ_BUFSIZE,
+    DEFAULT_STREAM_CHUNK_SIZE,
+)
 from aiagentplatformpy.exception import AiAgentPlatform_PKCE_AUTH_ERROR_TYPE_ENUMS, AiAgentPlatformAPIError, AiAgentPlatformPKCEAuthError, AiAgentPlatformPKCEAuthErrorType
 # from aiagentplatformpy.log import log_debug, log_warning
 from aiagentplatformpy.model import (
@@ -27,14 +39,34 @@ from aiagentplatformpy.model import (
     IteratorHTTPResponse,
     ListResponse,
 )
+from aiagentplatformpy.util import aiter_lines, iter_lines
 
 
 if TYPE_CHECKING:
+    import aiohttp
+
     from aiagentplatformpy.auth import Auth
 
 T = TypeVar("T", bound=BaseModel)
 
 
+@lru_cache(maxsize=256)
+def _split_url(url: str) -> Tuple[str, str]:
+    """
+    Return the (host, path) of the url, the same few endpoint urls are signed on every call.
+    """
+    parsed_url = urlparse(url)
+    return parsed_url.netloc, parsed_url.path
+
+
+@lru_cache(maxsize=128)
+def _list_adapter(item_cast: Type[T]) -> TypeAdapter:
+    """
+    Return the cached adapter validating a whole list of item_cast in one call.
+    """
+    return TypeAdapter(List[item_cast])  # type: ignore
+
+
 class Requester:
     """
     http request helper class.
@@ -44,11 +76,109 @@ class Requester:
         self,
         auth: Optional["Auth"] = None,
         session: Optional[requests.Session] = None,
-        a_session: Optional[aiohttp.ClientSession] = None,
+        a_session: Optional["aiohttp.ClientSession"] = None,
     ):
         self._auth = auth
-        self._session = session if session else requests.Session()
+        # pick the auth step once, make_request only calls it
+        self._apply_auth = self._build_auth_applier(auth)
+        # created on the first sync request, async-only callers never build one
+        self._session = session
+        # a session passed in by the caller is used as is on every request
         self.a_session = a_session
+        # sessions created by _get_a_session, one per event loop since a session is bound to its loop
+        self._a_sessions: Dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+
+    @staticmethod
+    def _build_auth_applier(auth: Optional["Auth"]) -> Callable[[str, str, dict, Union[dict, str, None]], None]:
+        """
+        Return the function adding the auth headers of the given auth to a request.
+        """
+        # imported here, aiagentplatformpy.auth imports this module
+        from aiagentplatformpy.auth import AppAkskAuth, TokenAuth
+
+        if isinstance(auth, TokenAuth):
+            return lambda method, url, headers, body: auth.authentication(headers)
+        if isinstance(auth, AppAkskAuth):
+            return lambda method, url, headers, body: auth.ak_sk_sign(method, *_split_url(url), headers, body)
+        return lambda method, url, headers, body: None
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
+        # keep enough idle connections for concurrent callers instead of requests' default of 10
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self) -> None:
+        """
+        Close the requests session and release its pooled connections.
+        """
+        if self._session is not None:
+            self._session.close()
+
+    async def aclose(self) -> None:
+        """
+        Close the aiohttp session of the running event loop and the requests session.
+
+        Sessions of other event loops are left open, their owners close them from their own loop.
+        """
+        session = self._a_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+        if self.a_session is not None and not self.a_session.closed:
+            await self.a_session.close()
+        self.a_session = None
+        self.close()
+
+    def _get_session(self) -> requests.Session:
+        """
+        Return the requests session shared by all sync requests, creating it on first use.
+        """
+        session = self._session
+        if session is None:
+            session = self._session = self._new_session()
+        return session
+
+    def _get_a_session(self) -> "aiohttp.ClientSession":
+        """
+        Return the aiohttp session of the running event loop, creating it on first use.
+
+        A session is bound to the event loop it was created in, so each loop the requester
+        is used from (e.g. successive asyncio.run calls, or one loop per thread) gets its own.
+        """
+        if self.a_session is not None and not self.a_session.closed:
+            return self.a_session
+
+        # imported on first async use, sync-only callers never load aiohttp
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = self._a_sessions.get(loop)
+        if session is None or session.closed:
+            self._forget_closed_loop_sessions()
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=DEFAULT_MAX_CONNECTIONS,
+                    keepalive_timeout=DEFAULT_KEEPALIVE_EXPIRY,
+                    ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+                ),
+                read_bufsize=DEFAULT_READ_BUFSIZE,
+            )
+            self._a_sessions[loop] = session
+        return session
+
+    def _forget_closed_loop_sessions(self) -> None:
+        """
+        Drop the references to sessions of event loops that have been closed.
+
+        A session must be closed with aclose() inside its own loop, the async entry points do so
+        in a finally block. One left open when its loop closed cannot be closed any more, it is
+        only forgotten here so that the mapping does not keep growing.
+        """
+        for loop in [loop for loop in self._a_sessions if loop.is_closed()]:
+            del self._a_sessions[loop]
 
     def make_request(
         self,
@@ -66,13 +196,12 @@ class Requester:
             headers = {}
         # headers["User-Agent"] = user_agent()
         # headers["X-AiAgentPlatform-Client-User-Agent"] = aiagentplatform_client_user_agent()
-        if self._auth.__class__.__name__ == "TokenAuth":
-            self._auth.authentication(headers)
-        elif self._auth.__class__.__name__ == "AppAkskAuth":
-            parsed_url = urlparse(url)
-            host = parsed_url.netloc
-            uri = parsed_url.path
-            self._auth.ak_sk_sign(method, host, uri, headers, json)
+        # serialize the json body once, the same bytes are signed and sent
+        content = None
+        if json is not None and not files:
+            content = orjson.dumps(json)
+            headers["Content-Type"] = "application/json"
+        self._apply_auth(method, url, headers, content.decode("utf-8") if content is not None else json)
 
         # log_debug(
         #     "request %s#%s sending, params=%s, json=%s, stream=%s",
@@ -88,7 +217,8 @@ class Requester:
             url=url,
             params=params,
             headers=headers,
-            json_body=json,
+            json_body=json if content is None else None,
+            content=content,
             files=files,
             stream=stream,
             data_field=data_field,
@@ -227,11 +357,12 @@ class Requester:
             method=request.method,
             url=request.url,
             stream=request.stream,
-            response=self._session.request(
+            response=self._get_session().request(
                 request.method,
                 request.url,
                 params=request.params,
                 headers=request.headers,
+                data=request.content,
                 json=request.json_body,
                 files=request.files,
                 stream=request.stream,
@@ -351,24 +482,52 @@ class Requester:
                                     )
         return await self.asend(request)
 
+    async def arequest_many(
+        self,
+        specs: List[dict],
+        max_concurrency: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Send several requests concurrently over the shared aiohttp session.
+
+        Each spec holds the keyword arguments of arequest. At most max_concurrency requests
+        are in flight, results keep the order of specs. Streaming specs are not supported,
+        their responses would stay open.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send(spec: dict):
+            async with semaphore:
+                return await self.arequest(**spec)
+
+        return await asyncio.gather(*[send(spec) for spec in specs], return_exceptions=return_exceptions)
+
     async def asend(
         self,
         request: HTTPRequest,
     ) -> Union[T, List[T], ListResponse[T], AsyncIteratorHTTPResponse[str], FileHTTPResponse, None]:
+        response = await self._get_a_session().request(
+            request.method,
+            request.url,
+            params=request.params,
+            headers=request.headers,
+            data=request.content,
+            json=request.json_body)
+        content = None
+        resp_content_type = response.headers.get("content-type", "").lower()
+        if "event-stream" not in resp_content_type and "audio" not in resp_content_type:
+            # _parse_response is sync, read the json body here
+            content = await response.read()
         return self._parse_response(
             method=request.method,
             url=request.url,
             is_async=True,
-            response=await self.a_session.request(
-                request.method,
-                request.url,
-                params=request.params,
-                headers=request.headers,
-
-                json=request.json_body),
+            response=response,
             cast=request.cast,
             stream=request.stream,
             data_field=request.data_field,
+            content=content,
         )
 
     def _parse_response(
@@ -376,10 +535,11 @@ class Requester:
         method: str,
         url: str,
         stream: bool,
-        response: [requests.Response, aiohttp.ClientResponse],
+        response: Union[requests.Response, "aiohttp.ClientResponse"],
         cast: Union[Type[T], List[Type[T]], Type[ListResponse[T]], Type[FileHTTPResponse], None],
         data_field: str = "data",
-        is_async: Literal[True, False] = False
+        is_async: Literal[True, False] = False,
+        content: Optional[bytes] = None,
     ) -> Union[
         T, List[T], ListResponse[T], IteratorHTTPResponse[str], AsyncIteratorHTTPResponse[str], FileHTTPResponse, None
     ]:
@@ -387,14 +547,17 @@ class Requester:
         logid = response.headers.get("x-tt-logid")
         if "event-stream" in resp_content_type:
             if is_async:
-                # return AsyncIteratorHTTPResponse(response, response.content.iter_any())
-                return AsyncIteratorHTTPResponse(response, response.content.__aiter__())
-            return IteratorHTTPResponse(response, response.iter_lines())
+                # frame lines from whatever the socket delivered instead of per-line readline calls,
+                # which also lifts the readline limit on very long sse lines
+                return AsyncIteratorHTTPResponse(response, aiter_lines(response.content.iter_any()))
+            return IteratorHTTPResponse(response, iter_lines(response.iter_content(chunk_size=DEFAULT_STREAM_CHUNK_SIZE)))
 
         if resp_content_type and "audio" in resp_content_type:
             return FileHTTPResponse(response)
 
-        code, msg, data = self._parse_requests_code_msg(method, url, response, data_field)
+        code, msg, data = self._parse_requests_code_msg(
+            method, url, response, response.content if content is None else content, data_field
+        )
 
         if code is not None and code > 0:
             # log_warning("request %s#%s failed, logid=%s, code=%s, msg=%s", method, url, logid, code, msg)
@@ -405,11 +568,9 @@ class Requester:
                 raise AiAgentPlatformPKCEAuthError(AiAgentPlatformPKCEAuthErrorType(msg), logid)
             raise AiAgentPlatformAPIError(code, msg, logid)
         if isinstance(cast, List):
-            item_cast = cast[0]
-            return [item_cast.model_validate(item) for item in data]
+            return _list_adapter(cast[0]).validate_python(data)
         elif hasattr(cast, "__origin__") and cast.__origin__ is ListResponse:  # type: ignore
-            item_cast = get_args(cast)[0]
-            return ListResponse(response, [item_cast.model_validate(item) for item in data])
+            return ListResponse(response, _list_adapter(get_args(cast)[0]).validate_python(data))
         else:
             if cast is None:
                 return None
@@ -420,16 +581,21 @@ class Requester:
             return data
 
     def _parse_requests_code_msg(
-        self, method: str, url: str, response: requests.Response, data_field: str = "data"
+        self,
+        method: str,
+        url: str,
+        response: Union[requests.Response, "aiohttp.ClientResponse"],
+        content: bytes,
+        data_field: str = "data",
     ) -> Tuple[Optional[int], str, Any]:
         try:
-            body = response.json()
+            body = orjson.loads(content)
             logid = response.headers.get("x-tt-logid")
             # log_debug("request %s#%s responding, logid=%s, data=%s", method, url, logid, body)
-        except:
+        except ValueError:
             raise AiAgentPlatformAPIError(
-                response.status_code,
-                response.text,
+                response.status_code if isinstance(response, requests.Response) else response.status,
+                content.decode("utf-8", "replace"),
                 response.headers.get("x-tt-logid"),
             )
 
@@ -3,6 +3,7 @@ import hashlib
 import random
 import sys
 import wave
+from typing import AsyncIterator, Iterator
 
 if sys.version_info < (3, 10):
 
@@ -19,6 +20,51 @@ else:
     _ = anext
 
 
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Split an async iterator of raw byte chunks into lines, keeping the line endings.
+
+    Lines are cut on b"\n" before decoding, so a utf-8 character split across two chunks
+    reaches the decoder whole, and each chunk is scanned only once.
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        # the buffered tail has no newline, only the new bytes need to be searched
+        search = len(buffer)
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", search)
+            if end < 0:
+                break
+            yield bytes(buffer[start : end + 1])
+            start = search = end + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_lines(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Sync counterpart of aiter_lines: split an iterator of raw byte chunks into lines, keeping the line endings.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        # the buffered tail has no newline, only the new bytes need to be searched
+        search = len(buffer)
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", search)
+            if end < 0:
+                break
+            yield bytes(buffer[start : end + 1])
+            start = search = end + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer)
+
+
 def base64_encode_string(s: str) -> str:
     return base64.standard_b64encode(s.encode("utf-8")).decode("utf-8")
 
@@ -1,15 +1,40 @@
-import json
+import asyncio
 import os
-from typing import List, Dict, Any
+import time
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
 from aiagentplatformpy.auth import TokenAuth
 from aiagentplatformpy.chat import ChatEventType
 from aiagentplatformpy.aiagentplatform import AsyncAiAgentPlatform, AiAgentPlatform
 
 
+CONVERSATION_ID_FILE = "conversation_id.json"
+
+# 进程内缓存已读取/保存的对话ID：文件绝对路径 -> conversation_id，保存时同步更新，
+# 同一进程中新建的 MultiRoundChatAPI 不必再读文件
+_CONV_ID_CACHE: Dict[str, str] = {}
+
+# 进程内共享的同步平台客户端：(api_key, base_url) -> 客户端；
+# 异步客户端的 aiohttp 会话绑定事件循环且不是线程安全的，不在进程内共享，见 MultiRoundChatAPI.aiagentplatform_async
+_PLATFORMS: Dict[Tuple[str, str], AiAgentPlatform] = {}
+
+
+def _get_platform(api_key: str, base_url: str) -> AiAgentPlatform:
+    """获取或创建指定 api_key/base_url 的同步平台客户端"""
+    key = (api_key, base_url)
+    platform = _PLATFORMS.get(key)
+    if platform is None:
+        # 并发创建时以先写入的为准
+        platform = _PLATFORMS.setdefault(key, AiAgentPlatform(auth=TokenAuth(token=api_key), base_url=base_url))
+    return platform
+
+
 class MultiRoundChatAPI:
     """多轮对话API调用类"""
     
-    def __init__(self, api_key: str, base_url: str, user_id: str):
+    def __init__(self, api_key: str, base_url: str, user_id: str, cache_ttl: float = 0,
+                 max_history: Optional[int] = None, max_concurrency: int = 32, cache_maxsize: int = 1024):
         """
         初始化多轮对话API
         
@@ -17,37 +42,86 @@ class MultiRoundChatAPI:
             api_key: API密钥
             base_url: API基础URL
             user_id: 用户ID
+            cache_ttl: send_message 回复缓存的有效秒数，同一对话中相同的消息在有效期内直接返回缓存的回复；
+                默认 0 表示不缓存。回复依赖上下文的对话不要开启，对固定问题可设为 3600
+            max_history: 本地保留的对话历史条数上限，超出后丢弃最早的记录；默认 None 表示不限制。
+                对话上下文由服务端保存，这里只影响 get_chat_history / save_chat_history 的内容
+            max_concurrency: multi_round_chat_async 同时进行中的请求数上限，需不大于连接池大小
+            cache_maxsize: 回复缓存的条目上限，超出后淘汰最久未使用的条目
         """
         self.api_key = api_key
         self.base_url = base_url
         self.user_id = user_id
         self.conversation_id = None
-        self.chat_history = []  # 存储所有对话历史
+        self.chat_history = deque(maxlen=max_history)  # 存储对话历史，追加为 O(1)，超出上限时自动丢弃最早的记录
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        # (conversation_id, message) -> (过期时间, 回复)，按最近使用排序
+        self._answer_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.max_concurrency = max_concurrency
         
-        # 初始化AI智能体平台
-        self.aiagentplatform = AiAgentPlatform(
-            auth=TokenAuth(token=api_key),
-            base_url=base_url
-        )
+        # 同一进程中相同 api_key/base_url 的实例共用同步客户端及其连接池
+        self.aiagentplatform = _get_platform(api_key, base_url)
+        # 异步客户端按事件循环各建一个：事件循环 -> 客户端
+        self._async_platforms: Dict[asyncio.AbstractEventLoop, AsyncAiAgentPlatform] = {}
     
-    def save_conversation_id(self, conversation_id: str):
-        """保存对话ID到文件"""
+    @property
+    def aiagentplatform_async(self) -> AsyncAiAgentPlatform:
+        """当前事件循环的异步客户端，首次在该循环中使用时创建；须在该循环结束前调用 aclose() 关闭"""
+        loop = asyncio.get_running_loop()
+        platform = self._async_platforms.get(loop)
+        if platform is None:
+            # 事件循环结束前没有 aclose() 的客户端已无法再关闭，这里只去掉引用，避免映射无限增长
+            for closed_loop in [l for l in self._async_platforms if l.is_closed()]:
+                del self._async_platforms[closed_loop]
+            platform = self._async_platforms[loop] = self.create_async_platform()
+        return platform
+    
+    def create_async_platform(self) -> AsyncAiAgentPlatform:
+        """创建独立的异步客户端，只能在创建后首次使用它的事件循环中使用，由调用方负责关闭"""
+        return AsyncAiAgentPlatform(auth=TokenAuth(token=self.api_key), base_url=self.base_url)
+    
+    @staticmethod
+    def _write_file(path: str, payload: bytes):
+        """把已序列化的内容写入文件"""
+        with open(path, "wb") as f:
+            f.write(payload)
+    
+    def _dump_conversation_id(self, conversation_id: str) -> bytes:
         data = {
             "conversation_id": conversation_id,
             "user_id": self.user_id,
-            "timestamp": "2025-08-03"
+            "timestamp": time.time_ns()
         }
-        with open("conversation_id.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"✅ 对话ID已保存到 conversation_id.json")
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    
+    def save_conversation_id(self, conversation_id: str):
+        """保存对话ID到文件"""
+        self._write_file(CONVERSATION_ID_FILE, self._dump_conversation_id(conversation_id))
+        _CONV_ID_CACHE[os.path.abspath(CONVERSATION_ID_FILE)] = conversation_id
+        print(f"✅ 对话ID已保存到 {CONVERSATION_ID_FILE}")
+    
+    async def save_conversation_id_async(self, conversation_id: str):
+        """保存对话ID到文件，写文件在线程池中进行，不阻塞事件循环"""
+        payload = self._dump_conversation_id(conversation_id)
+        await asyncio.get_running_loop().run_in_executor(None, self._write_file, CONVERSATION_ID_FILE, payload)
+        _CONV_ID_CACHE[os.path.abspath(CONVERSATION_ID_FILE)] = conversation_id
+        print(f"✅ 对话ID已保存到 {CONVERSATION_ID_FILE}")
     
     def load_conversation_id(self) -> str:
-        """从文件加载对话ID"""
+        """从文件加载对话ID，同一进程中只在首次读取文件"""
+        path = os.path.abspath(CONVERSATION_ID_FILE)
+        cached = _CONV_ID_CACHE.get(path)
+        if cached:
+            return cached
         try:
-            if os.path.exists("conversation_id.json"):
-                with open("conversation_id.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return data.get("conversation_id")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read())
+                conversation_id = data.get("conversation_id")
+                if conversation_id:
+                    _CONV_ID_CACHE[path] = conversation_id
+                return conversation_id
         except Exception as e:
             print(f"加载对话ID失败: {e}")
         return None
@@ -101,6 +175,11 @@ class MultiRoundChatAPI:
         if not self.conversation_id:
             raise ValueError("对话ID未初始化，请先调用create_or_load_conversation()")
         
+        cached_answer = self._get_cached_answer(message)
+        if cached_answer is not None:
+            print(f"命中缓存: {message}")
+            return self._record_response(message, cached_answer)
+        
         try:
             print(f"发送消息: {message}")
             chat_res = self.aiagentplatform.chat.create(
@@ -109,16 +188,46 @@ class MultiRoundChatAPI:
                 query=message
             )
             
-            # 构建响应数据
-            response_data = {
-                "message": message,
-                "answer": chat_res.answer,
-                "conversation_id": self.conversation_id,
-                "timestamp": "2025-08-03"  # 可以添加实际时间戳
-            }
+            self._cache_answer(message, chat_res.answer)
+            response_data = self._record_response(message, chat_res.answer)
+            
+            print(f"智能体回复: {chat_res.answer}")
+            return response_data
+            
+        except Exception as e:
+            print(f"发送消息失败: {e}")
+            raise
+    
+    async def send_message_async(self, message: str,
+                                 platform: Optional[AsyncAiAgentPlatform] = None) -> Dict[str, Any]:
+        """
+        异步发送单条消息并获取回复，使用异步客户端的共享连接池
+        
+        Args:
+            message: 要发送的消息
+            platform: 发送使用的异步客户端，默认使用当前事件循环的客户端
+            
+        Returns:
+            response_data: 包含回复信息的字典
+        """
+        if not self.conversation_id:
+            raise ValueError("对话ID未初始化，请先调用create_or_load_conversation()")
+        
+        cached_answer = self._get_cached_answer(message)
+        if cached_answer is not None:
+            print(f"命中缓存: {message}")
+            return self._record_response(message, cached_answer)
+        
+        try:
+            print(f"发送消息: {message}")
+            chat_res = await (platform or self.aiagentplatform_async).chat.create(
+                user_id=self.user_id,
+                conversation_id=self.conversation_id,
+                query=message
+            )
             
-            # 保存到对话历史
-            self.chat_history.append(response_data)
+            self._cache_answer(message, chat_res.answer)
+            response_data = self._record_response(message, chat_res.answer)
             
             print(f"智能体回复: {chat_res.answer}")
             return response_data
@@ -127,6 +236,38 @@ class MultiRoundChatAPI:
             print(f"发送消息失败: {e}")
             raise
     
+    def _get_cached_answer(self, message: str) -> Optional[str]:
+        """返回缓存中未过期的回复，未开启缓存或未命中时返回 None"""
+        if self.cache_ttl > 0:
+            key = (self.conversation_id, message)
+            cached = self._answer_cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self._answer_cache.move_to_end(key)
+                    return cached[1]
+                # 已过期，删除后按未命中处理
+                del self._answer_cache[key]
+        return None
+    
+    def _cache_answer(self, message: str, answer: str):
+        if self.cache_ttl > 0:
+            key = (self.conversation_id, message)
+            self._answer_cache[key] = (time.monotonic() + self.cache_ttl, answer)
+            self._answer_cache.move_to_end(key)
+            if len(self._answer_cache) > self.cache_maxsize:
+                self._answer_cache.popitem(last=False)
+    
+    def _record_response(self, message: str, answer: str) -> Dict[str, Any]:
+        """构建响应数据并保存到对话历史"""
+        response_data = {
+            "message": message,
+            "answer": answer,
+            "conversation_id": self.conversation_id,
+            "timestamp": time.time_ns()  # 纳秒级Unix时间戳，展示时再格式化
+        }
+        self.chat_history.append(response_data)
+        return response_data
+    
     def multi_round_chat(self, messages: List[str]) -> List[Dict[str, Any]]:
         """
         进行多轮对话
@@ -151,15 +292,82 @@ class MultiRoundChatAPI:
         
         return responses
     
+    async def multi_round_chat_async(self, messages: List[str]) -> List[Dict[str, Any]]:
+        """
+        并发发送多条相互独立的消息
+        
+        所有消息同时发出，服务端的处理顺序没有保证，因此只适用于互不依赖上下文的问题；
+        需要依赖前文的多轮对话请使用 multi_round_chat。
+        
+        Args:
+            messages: 要发送的消息列表
+            
+        Returns:
+            responses: 成功的回复列表，顺序与 messages 一致
+        """
+        if not self.conversation_id:
+            raise ValueError("对话ID未初始化，请先调用create_or_load_conversation()")
+        
+        print(f"\n=== 并发发送{len(messages)}条消息 ===")
+        # 限制同时进行中的请求数，消息很多时避免一次性占满连接池、请求排队超时
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def send(message: str):
+            async with semaphore:
+                return await self.aiagentplatform_async.chat.create(
+                    user_id=self.user_id,
+                    conversation_id=self.conversation_id,
+                    query=message
+                )
+        
+        try:
+            results = await asyncio.gather(
+                *(send(message) for message in messages),
+                return_exceptions=True
+            )
+        finally:
+            # 在当前事件循环内关闭其客户端，下次调用会重新创建
+            await self.aclose()
+        
+        responses = []
+        for i, (message, chat_res) in enumerate(zip(messages, results), 1):
+            if isinstance(chat_res, Exception):
+                print(f"第{i}条消息失败: {chat_res}")
+                continue
+            responses.append(self._record_response(message, chat_res.answer))
+        
+        return responses
+    
+    async def aclose(self):
+        """关闭当前事件循环的异步客户端的连接池，其他事件循环的客户端不受影响"""
+        platform = self._async_platforms.pop(asyncio.get_running_loop(), None)
+        if platform is not None:
+            await platform.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
     def get_chat_history(self) -> List[Dict[str, Any]]:
         """获取对话历史"""
-        return self.chat_history
+        return list(self.chat_history)
     
     def save_chat_history(self, filename: str = "chat_history.json"):
         """保存对话历史到文件"""
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.chat_history, f, indent=2, ensure_ascii=False)
+            self._write_file(filename, orjson.dumps(list(self.chat_history), option=orjson.OPT_INDENT_2))
+            print(f"✅ 对话历史已保存到 {filename}")
+        except Exception as e:
+            print(f"保存对话历史失败: {e}")
+    
+    async def save_chat_history_async(self, filename: str = "chat_history.json"):
+        """保存对话历史到文件，写文件在线程池中进行，不阻塞事件循环"""
+        try:
+            # 在事件循环线程中序列化出快照，写文件期间对话历史仍可继续追加
+            payload = orjson.dumps(list(self.chat_history), option=orjson.OPT_INDENT_2)
+            await asyncio.get_running_loop().run_in_executor(None, self._write_file, filename, payload)
             print(f"✅ 对话历史已保存到 {filename}")
         except Exception as e:
             print(f"保存对话历史失败: {e}")
@@ -174,27 +382,26 @@ class MultiRoundChatAPI:
         Returns:
             processed_data: 处理后的数据
         """
+        answers = [response["answer"] for response in responses]
         processed_data = {
             "total_rounds": len(responses),
             "conversation_id": self.conversation_id,
             "user_id": self.user_id,
-            "messages": [],
-            "answers": [],
+            "messages": [response["message"] for response in responses],
+            "answers": answers,
             "summary": {}
         }
+        # 可以在这里添加更多的数据处理逻辑
+        # 例如：关键词提取、情感分析、内容总结等
         
-        for i, response in enumerate(responses, 1):
-            processed_data["messages"].append(response["message"])
-            processed_data["answers"].append(response["answer"])
-            
-            # 可以在这里添加更多的数据处理逻辑
-            # 例如：关键词提取、情感分析、内容总结等
+        # 回复长度由 C 实现的 map 求和，不逐条执行 Python 循环体
+        total_answer_length = sum(map(len, answers))
         
         # 生成摘要信息
         processed_data["summary"] = {
             "first_message": responses[0]["message"] if responses else None,
             "last_message": responses[-1]["message"] if responses else None,
-            "average_answer_length": sum(len(ans) for ans in processed_data["answers"]) / len(processed_data["answers"]) if processed_data["answers"] else 0
+            "average_answer_length": total_answer_length / len(responses) if responses else 0
         }
         
         return processed_data
@@ -203,10 +410,10 @@ class MultiRoundChatAPI:
 def main():
     """主函数 - 演示多轮对话API的使用"""
     
-    # 配置参数
-    api_key = 'd2a7gnen04uuiosfsnk0'
-    base_url = 'https://aiagentplatform.cmft.com'
-    user_id = 'Siga'
+    # 配置参数，可通过环境变量覆盖
+    api_key = os.environ.get('RESUME_API_KEY', 'd2a7gnen04uuiosfsnk0')
+    base_url = os.environ.get('RESUME_BASE_URL', 'https://aiagentplatform.cmft.com')
+    user_id = os.environ.get('RESUME_USER_ID', 'Siga')
     
     # 创建多轮对话API实例
     chat_api = MultiRoundChatAPI(api_key, base_url, user_id)
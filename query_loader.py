@@ -1,6 +1,27 @@
+import csv
+import hashlib
+import io
+import openpyxl
 import pandas as pd
 import os
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    # 可选依赖，未安装时使用 openpyxl 读取
+    CalamineWorkbook = None
+
+
+# 查询统一补齐的后缀，与示例文件及 streamlit_app 生成的查询保持一致
+QUERY_SUFFIX = "的简历情况"
+
+# 视为已完整的查询后缀；"的简历信息" 是旧版 Excel 读取补齐的后缀，已有文件中以它结尾的查询保持不变
+_COMPLETE_SUFFIXES = (QUERY_SUFFIX, "的简历信息")
+
+# 文件扩展名 -> 文件类型
+_EXT_MAP = {'xlsx': 'excel', 'xls': 'excel', 'csv': 'csv', 'txt': 'txt'}
 
 
 class QueryLoader:
@@ -10,6 +31,98 @@ class QueryLoader:
         """初始化查询加载器"""
         pass
     
+    def iter_from_excel(self, filename: str, sheet_name: str = "Sheet1", column_index: int = 0) -> Iterator[str]:
+        """
+        逐条产出Excel文件中的查询，不构建完整列表；读取失败时异常直接抛给调用方
+        
+        Args:
+            filename: Excel文件名
+            sheet_name: 工作表名称
+            column_index: 列索引（0表示第一列）
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        return self._iter_excel(filename, filename.lower().endswith('.xls'), sheet_name, column_index)
+    
+    def _iter_excel(self, source, is_xls: bool, sheet_name: str, column_index: int) -> Iterator[str]:
+        """
+        逐条产出Excel工作簿中的查询
+        
+        Args:
+            source: Excel文件名或二进制文件对象
+            is_xls: 是否为旧版 .xls 格式
+            sheet_name: 工作表名称
+            column_index: 列索引（0表示第一列）
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        if CalamineWorkbook is not None:
+            # 安装了 python-calamine 时用其 Rust 解析器读取，.xlsx 与 .xls 均支持，跳过首行表头
+            workbook = CalamineWorkbook.from_object(source)
+            try:
+                # 保留开头的空行和空列，行列位置与 openpyxl 读取的一致
+                rows = workbook.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+            finally:
+                workbook.close()
+            # calamine 把数字读为浮点数，整数值还原为 int，与 openpyxl 的结果一致；空单元格为空字符串
+            cells = (row[column_index] for row in rows[1:] if len(row) > column_index)
+            yield from self._iter_queries(
+                int(cell) if isinstance(cell, float) and cell.is_integer() else cell for cell in cells
+            )
+        elif is_xls:
+            # openpyxl 不支持旧版 .xls，仍交给 pandas 读取
+            df = pd.read_excel(source, sheet_name=sheet_name)
+            yield from self._iter_queries(df.iloc[:, column_index].dropna())
+        else:
+            # 只读模式流式解析，只取指定列，跳过首行表头（与 pd.read_excel 一致）
+            workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+            try:
+                rows = workbook[sheet_name].iter_rows(
+                    min_row=2, min_col=column_index + 1, max_col=column_index + 1, values_only=True
+                )
+                yield from self._iter_queries(row[0] for row in rows)
+            finally:
+                workbook.close()
+    
+    def iter_from_csv(self, filename: str, column_index: int = 0, encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        逐条产出CSV文件中的查询，不构建完整列表；读取失败时异常直接抛给调用方
+        
+        Args:
+            filename: CSV文件名
+            column_index: 列索引（0表示第一列）
+            encoding: 文件编码
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        # 逐行读取CSV文件
+        with open(filename, 'r', encoding=encoding, newline='') as f:
+            yield from self._iter_csv(f, column_index)
+    
+    def _iter_csv(self, lines: Iterable[str], column_index: int) -> Iterator[str]:
+        """逐行解析CSV内容，跳过首行表头（与 pd.read_csv 一致）"""
+        reader = csv.reader(lines)
+        next(reader, None)
+        yield from self._iter_queries(row[column_index] for row in reader if len(row) > column_index)
+    
+    def iter_from_txt(self, filename: str, encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        逐条产出文本文件中的查询（每行一个查询），不构建完整列表；读取失败时异常直接抛给调用方
+        
+        Args:
+            filename: 文本文件名
+            encoding: 文件编码
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        # 按行迭代文件对象，行尾换行符由 strip 去掉
+        with open(filename, 'r', encoding=encoding) as f:
+            yield from self._iter_queries(f)
+    
     def load_from_excel(self, filename: str, sheet_name: str = "Sheet1", column_index: int = 0) -> List[str]:
         """
         从Excel文件读取查询列表
@@ -23,22 +136,7 @@ class QueryLoader:
             queries: 查询列表
         """
         try:
-            # 读取Excel文件
-            df = pd.read_excel(filename, sheet_name=sheet_name)
-            
-            # 获取指定列数据
-            column_data = df.iloc[:, column_index]
-            
-            # 过滤空值和NaN，并自动补齐"的简历情况"
-            queries = []
-            for query in column_data:
-                if pd.notna(query) and str(query).strip():
-                    query_text = str(query).strip()
-                    # 如果查询不包含"的简历情况"，则自动添加
-                    if not query_text.endswith("的简历信息"):
-                        # query_text += "？"
-                        query_text += "的简历信息"
-                    queries.append(query_text)
+            queries = list(self.iter_from_excel(filename, sheet_name, column_index))
             
             print(f"✅ 从Excel文件 {filename} 成功读取 {len(queries)} 个查询")
             return queries
@@ -63,21 +161,7 @@ class QueryLoader:
             queries: 查询列表
         """
         try:
-            # 读取CSV文件
-            df = pd.read_csv(filename, encoding=encoding)
-            
-            # 获取指定列数据
-            column_data = df.iloc[:, column_index]
-            
-            # 过滤空值和NaN，并自动补齐"的简历情况"
-            queries = []
-            for query in column_data:
-                if pd.notna(query) and str(query).strip():
-                    query_text = str(query).strip()
-                    # 如果查询不包含"的简历情况"，则自动添加
-                    if not query_text.endswith("的简历情况"):
-                        query_text += "的简历情况"
-                    queries.append(query_text)
+            queries = list(self.iter_from_csv(filename, column_index, encoding))
             
             print(f"✅ 从CSV文件 {filename} 成功读取 {len(queries)} 个查询")
             return queries
@@ -101,18 +185,7 @@ class QueryLoader:
             queries: 查询列表
         """
         try:
-            with open(filename, 'r', encoding=encoding) as f:
-                lines = f.readlines()
-            
-            # 过滤空行和空白字符，并自动补齐"的简历情况"
-            queries = []
-            for line in lines:
-                if line.strip():
-                    query_text = line.strip()
-                    # 如果查询不包含"的简历情况"，则自动添加
-                    if not query_text.endswith("的简历情况"):
-                        query_text += "的简历情况"
-                    queries.append(query_text)
+            queries = list(self.iter_from_txt(filename, encoding))
             
             print(f"✅ 从文本文件 {filename} 成功读取 {len(queries)} 个查询")
             return queries
@@ -124,6 +197,32 @@ class QueryLoader:
             print(f"❌ 读取文本文件失败: {e}")
             return []
     
+    @staticmethod
+    def _iter_queries(values: Iterable) -> Iterator[str]:
+        """
+        过滤空值和空白字符，为不以 _COMPLETE_SUFFIXES 中任一后缀结尾的查询补齐 QUERY_SUFFIX，并按首次出现的顺序去重，
+        避免重复的查询产生重复的接口请求
+        
+        Args:
+            values: 原始单元格或行的值
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        suffix = QUERY_SUFFIX
+        seen = set()
+        for value in values:
+            if value is None:
+                continue
+            query = str(value).strip()
+            if not query:
+                continue
+            if not query.endswith(_COMPLETE_SUFFIXES):
+                query += suffix
+            if query not in seen:
+                seen.add(query)
+                yield query
+    
     def load_queries(self, filename: str, file_type: Optional[str] = None) -> List[str]:
         """
         智能加载查询列表（自动检测文件类型）
@@ -156,6 +255,95 @@ class QueryLoader:
             print(f"❌ 不支持的文件类型: {file_type}")
             return []
     
+    def iter_queries(self, filename: str, file_type: Optional[str] = None) -> Iterator[str]:
+        """
+        逐条产出查询（自动检测文件类型），适合边读边发送请求的调用方；读取失败时异常直接抛给调用方
+        
+        Args:
+            filename: 文件名
+            file_type: 文件类型（可选，自动检测）
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        if file_type is None:
+            file_type = self._detect_file_type(filename)
+        
+        if file_type == 'excel':
+            return self.iter_from_excel(filename)
+        elif file_type == 'csv':
+            return self.iter_from_csv(filename)
+        elif file_type == 'txt':
+            return self.iter_from_txt(filename)
+        raise ValueError(f"不支持的文件类型: {file_type}")
+    
+    def iter_from_bytes(self, data: bytes, filename: str, file_type: Optional[str] = None,
+                        encoding: str = 'utf-8') -> Iterator[str]:
+        """
+        逐条产出内存中文件内容（如上传的文件）的查询，无需先写入临时文件；读取失败时异常直接抛给调用方
+        
+        Args:
+            data: 文件内容
+            filename: 原始文件名，用于检测文件类型
+            file_type: 文件类型（可选，自动检测）
+            encoding: CSV/文本内容的编码
+            
+        Returns:
+            queries: 查询迭代器
+        """
+        if file_type is None:
+            file_type = self._detect_file_type(filename)
+        
+        if file_type == 'excel':
+            return self._iter_excel(io.BytesIO(data), filename.lower().endswith('.xls'), "Sheet1", 0)
+        elif file_type == 'csv':
+            return self._iter_csv(io.StringIO(data.decode(encoding), newline=''), 0)
+        elif file_type == 'txt':
+            # newline=None 与按文本模式打开文件一致，统一换行符
+            return self._iter_queries(io.StringIO(data.decode(encoding), newline=None))
+        raise ValueError(f"不支持的文件类型: {file_type}")
+    
+    def load_queries_from_bytes(self, data: bytes, filename: str, file_type: Optional[str] = None) -> List[str]:
+        """
+        从内存中的文件内容加载查询列表（自动检测文件类型）
+        
+        Args:
+            data: 文件内容
+            filename: 原始文件名，用于检测文件类型
+            file_type: 文件类型（可选，自动检测）
+            
+        Returns:
+            queries: 查询列表
+        """
+        try:
+            queries = list(self.iter_from_bytes(data, filename, file_type))
+            
+            print(f"✅ 从文件 {filename} 成功读取 {len(queries)} 个查询")
+            return queries
+            
+        except ValueError as e:
+            print(f"❌ {e}")
+            return []
+        except Exception as e:
+            print(f"❌ 读取文件 {filename} 失败: {e}")
+            return []
+    
+    def load_many(self, filenames: List[str], max_workers: int = 8) -> List[List[str]]:
+        """
+        用线程池并发加载多个查询文件（自动检测文件类型）
+        
+        Args:
+            filenames: 文件名列表
+            max_workers: 最大并发线程数
+            
+        Returns:
+            queries_list: 与 filenames 顺序一致的查询列表
+        """
+        if not filenames:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(filenames))) as executor:
+            return list(executor.map(self.load_queries, filenames))
+    
     def _detect_file_type(self, filename: str) -> str:
         """
         检测文件类型
@@ -166,17 +354,10 @@ class QueryLoader:
         Returns:
             file_type: 文件类型
         """
-        extension = filename.lower().split('.')[-1]
+        extension = os.path.splitext(filename)[1][1:].lower()
         
-        if extension in ['xlsx', 'xls']:
-            return 'excel'
-        elif extension == 'csv':
-            return 'csv'
-        elif extension == 'txt':
-            return 'txt'
-        else:
-            # 默认尝试Excel
-            return 'excel'
+        # 未知扩展名默认尝试Excel
+        return _EXT_MAP.get(extension, 'excel')
     
     def create_sample_files(self):
         """创建示例文件"""
@@ -190,22 +371,33 @@ class QueryLoader:
             "华中科技大学-机械工程-刘伟的简历情况"
         ]
         
+        # 示例内容未变且文件都在时跳过重新生成，内容摘要记录在旁路文件中
+        digest = hashlib.sha1(repr(sample_queries).encode('utf-8')).hexdigest()
+        sample_files = ["resume_queries.xlsx", "resume_queries.csv", "resume_queries.txt"]
+        digest_file = "resume_queries.sha1"
+        if all(os.path.exists(name) for name in sample_files) and os.path.exists(digest_file):
+            with open(digest_file, 'r', encoding='utf-8') as f:
+                if f.read().strip() == digest:
+                    print(f"示例文件已是最新，跳过创建，包含 {len(sample_queries)} 个查询")
+                    return
+        
         # 创建Excel文件
-        df_excel = pd.DataFrame({'简历查询': sample_queries})
-        df_excel.to_excel("resume_queries.xlsx", index=False, sheet_name='Sheet1')
+        df = pd.DataFrame({'简历查询': sample_queries})
+        df.to_excel("resume_queries.xlsx", index=False, sheet_name='Sheet1')
         print("✅ 创建示例Excel文件: resume_queries.xlsx")
         
         # 创建CSV文件
-        df_csv = pd.DataFrame({'简历查询': sample_queries})
-        df_csv.to_csv("resume_queries.csv", index=False, encoding='utf-8')
+        df.to_csv("resume_queries.csv", index=False, encoding='utf-8')
         print("✅ 创建示例CSV文件: resume_queries.csv")
         
-        # 创建TXT文件
+        # 创建TXT文件，一次写入全部行
         with open("resume_queries.txt", 'w', encoding='utf-8') as f:
-            for query in sample_queries:
-                f.write(query + '\n')
+            f.write('\n'.join(sample_queries) + '\n')
         print("✅ 创建示例TXT文件: resume_queries.txt")
         
+        with open(digest_file, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        
         print(f"\n示例文件已创建，包含 {len(sample_queries)} 个查询")
 
 
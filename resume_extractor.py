@@ -1,16 +1,181 @@
-import json
+import asyncio
+import hashlib
 import pandas as pd
 import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+import orjson
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from aiagentplatformpy.aiagentplatform import AsyncAiAgentPlatform
+from aiagentplatformpy.exception import AiAgentPlatformAPIError
 from multi_round_chat import MultiRoundChatAPI
 from query_loader import QueryLoader
 
 
+def records_to_dataframe(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    把字段不完全相同的记录列表按列收集后构建 DataFrame，列顺序为字段首次出现的顺序，缺失字段为 None，
+    列表字段在收集时拼接为 "; " 分隔的字符串以便表格显示
+    
+    Args:
+        records: 记录列表
+        
+    Returns:
+        df: 构建的 DataFrame
+    """
+    row_count = len(records)
+    columns: Dict[str, list] = {}
+    for i, record in enumerate(records):
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * row_count
+            if isinstance(value, list):
+                value = '; '.join(map(str, value))
+            column[i] = value
+    return pd.DataFrame(columns)
+
+
+def _is_non_scalar(value) -> bool:
+    return isinstance(value, (dict, list, tuple, set))
+
+
+def write_excel_sheet(target, df: pd.DataFrame, sheet_name: str, adjust_width: bool = True):
+    """
+    以 openpyxl 只写模式把 DataFrame 写入单个工作表，逐行流式写出，不构建单元格对象图
+    
+    Args:
+        target: 输出文件名或可写的文件对象
+        df: 要写出的数据
+        sheet_name: 工作表名称
+        adjust_width: 是否按内容调整列宽（最大宽度50）
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    notna = df.notna()
+    
+    if adjust_width:
+        # 只写模式下列宽须在写入首行前设置；按列向量化计算内容长度，空值按 0 计
+        lengths = df.astype(str).apply(lambda column: column.str.len()).where(notna, 0).max().fillna(0)
+        header_lengths = pd.Series([len(str(column)) for column in df.columns], index=df.columns)
+        widths = (lengths.combine(header_lengths, max) + 2).clip(upper=50)  # 最大宽度50
+        for i, width in enumerate(widths, 1):
+            worksheet.column_dimensions[get_column_letter(i)].width = int(width)
+    
+    # 空值写成空单元格，与 DataFrame.to_excel 一致
+    df = df.astype(object).where(notna, None)
+    # openpyxl 不接受 dict、list 等单元格值，与 DataFrame.to_excel 一样写成 str(value)；只转换含有这类值的列
+    for column in df.columns:
+        values = df[column]
+        if values.map(_is_non_scalar).any():
+            df[column] = values.map(lambda value: str(value) if _is_non_scalar(value) else value)
+    
+    header_font = Font(bold=True)
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(column))
+        cell.font = header_font
+        header.append(cell)
+    worksheet.append(header)
+    for row in df.itertuples(index=False, name=None):
+        worksheet.append(row)
+    workbook.save(target)
+
+
+class ResumeCache:
+    """简历提取结果缓存，按作用域（服务地址、智能体、用户）和查询精确匹配，使用 sqlite 持久化，可跨进程和会话复用"""
+    
+    def __init__(self, path: str = "resume_cache.db", ttl: Optional[float] = 24 * 3600):
+        """
+        初始化简历缓存
+        
+        Args:
+            path: sqlite 数据库文件路径，传入 ":memory:" 时只在进程内缓存
+            ttl: 缓存有效秒数，过期后按未命中处理并重新提取，知识库中更新过的简历因此能被重新读取；
+                None 表示永不过期
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Streamlit 的不同会话在不同线程中共用同一缓存，访问由锁串行化
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS resume_cache ("
+                "query_hash TEXT PRIMARY KEY, query TEXT NOT NULL, extracted_json TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            # 打开时清理已过期的记录，数据库不随时间无限增长
+            if ttl is not None:
+                self._conn.execute("DELETE FROM resume_cache WHERE created_at < ?", (self._expired_before(),))
+    
+    @staticmethod
+    def _hash(query: str, scope: str) -> str:
+        return hashlib.sha256(f"{scope}\n{query.strip()}".encode('utf-8')).hexdigest()
+    
+    def _expired_before(self) -> int:
+        """早于该写入时间（纳秒）的记录已过期"""
+        return time.time_ns() - int(self.ttl * 1e9)
+    
+    def get(self, query: str, scope: str = "") -> Optional[Dict[str, Any]]:
+        """
+        返回查询已缓存且未过期的提取结果，未命中时返回 None
+        
+        Args:
+            query: 简历查询问题
+            scope: 缓存作用域，不同服务地址、智能体或用户的结果互不命中
+        """
+        query_hash = self._hash(query, scope)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT extracted_json, created_at FROM resume_cache WHERE query_hash = ?", (query_hash,)
+            ).fetchone()
+            if row and self.ttl is not None and row[1] < self._expired_before():
+                with self._conn:
+                    self._conn.execute("DELETE FROM resume_cache WHERE query_hash = ?", (query_hash,))
+                return None
+        return orjson.loads(row[0]) if row else None
+    
+    def put(self, query: str, extracted_info: Dict[str, Any], scope: str = ""):
+        """缓存查询的提取结果并记录写入时间，已存在时覆盖"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resume_cache VALUES (?, ?, ?, ?)",
+                (self._hash(query, scope), query, orjson.dumps(extracted_info).decode('utf-8'), time.time_ns()),
+            )
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
 class ResumeExtractor:
     """简历信息提取器"""
     
-    def __init__(self, api_key: str, base_url: str, user_id: str):
+    # 判断记录是否为空时检查的关键字段（排除系统添加的字段）
+    _KEY_FIELDS = frozenset({
+        '姓名', '性别', '最高学历', '硕士专业', '硕士院校', '硕士院校类别',
+        '本科院校', '本科院校类别', '本科专业', '成绩排名', '项目经历',
+        '项目经历关键词tag', '实习经历', '实习经历关键词tag', '硕士课题内容',
+        '课题内容关键词', '奖学金情况', '英语能力大学英语等级',
+        '英语能力托福和雅思及其分数', '编程语言', '加分项'
+    })
+    
+    # 任一关键字段名的单次扫描模式，长字段名优先，避免被其前缀截断
+    _KEY_FIELDS_RE = re.compile('|'.join(map(re.escape, sorted(_KEY_FIELDS, key=len, reverse=True))))
+    
+    # 回复中的 ```json 代码块
+    _JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+    
+    def __init__(self, api_key: str, base_url: str, user_id: str, cache: Optional[ResumeCache] = None,
+                 bypass_cache: bool = False):
         """
         初始化简历提取器
         
@@ -18,8 +183,14 @@ class ResumeExtractor:
             api_key: API密钥
             base_url: API基础URL
             user_id: 用户ID
+            cache: 提取结果缓存（可选），命中时不再请求智能体
+            bypass_cache: 为 True 时不读取缓存、总是重新提取，新的结果仍写入缓存
         """
         self.chat_api = MultiRoundChatAPI(api_key, base_url, user_id)
+        self.cache = cache
+        self.bypass_cache = bypass_cache
+        # 缓存按服务地址、智能体（API密钥）和用户隔离
+        self._cache_scope = "\n".join((base_url, api_key, user_id))
         self.extracted_data = []  # 存储所有提取的简历数据
         
     def extract_json_from_response(self, response_text: str) -> Optional[Dict[str, Any]]:
@@ -33,31 +204,24 @@ class ResumeExtractor:
             parsed_data: 解析后的JSON数据，如果解析失败返回None
         """
         try:
-            # 查找JSON开始和结束的位置
-            start_marker = "```json"
-            end_marker = "```"
-            
-            start_pos = response_text.find(start_marker)
-            if start_pos == -1:
-                # 如果没有找到```json标记，尝试直接解析整个文本
-                return json.loads(response_text.strip())
-            
-            # 找到JSON开始位置
-            json_start = start_pos + len(start_marker)
+            # 不含 { 的回复不可能是JSON对象，无需再解析
+            if '{' not in response_text:
+                print(f"回复中没有JSON对象: {response_text[:200]}...")
+                return None
             
-            # 找到JSON结束位置
-            end_pos = response_text.find(end_marker, json_start)
-            if end_pos == -1:
-                # 如果没有找到结束标记，尝试解析到文本末尾
-                json_text = response_text[json_start:].strip()
+            match = self._JSON_FENCE_RE.search(response_text)
+            if match:
+                # ```json 代码块，没有结束标记时取到文本末尾
+                json_text = match.group(1)
             else:
-                json_text = response_text[json_start:end_pos].strip()
+                # 没有```json标记时，取第一个 { 到最后一个 } 之间的内容
+                json_text = response_text[response_text.find('{'):response_text.rfind('}') + 1]
             
             # 解析JSON
-            parsed_data = json.loads(json_text)
+            parsed_data = orjson.loads(json_text.strip())
             return parsed_data
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"JSON解析失败: {e}")
             print(f"原始文本: {response_text[:200]}...")
             return None
@@ -75,38 +239,109 @@ class ResumeExtractor:
         Returns:
             extracted_info: 提取的简历信息字典
         """
+        cached_info = self._get_cached_info(query)
+        if cached_info is not None:
+            return cached_info
+        
         try:
             # 发送查询
             response = self.chat_api.send_message(query)
-            
-            # 提取JSON数据
-            extracted_info = self.extract_json_from_response(response['answer'])
-            
-            if extracted_info:
-                # 检查是否所有字段都为空
-                if self._is_all_fields_empty(extracted_info):
-                    print(f"提取的JSON数据所有字段都为空: {query}")
-                    return None
-                
-                # 添加查询信息
-                extracted_info['查询问题'] = query
-                extracted_info['对话ID'] = response['conversation_id']
-                extracted_info['时间戳'] = response['timestamp']
-                
-                # 处理列表字段，将其转换为字符串以便Excel显示
-                for key, value in extracted_info.items():
-                    if isinstance(value, list):
-                        extracted_info[key] = '; '.join(value) if value else ''
-                
-                return extracted_info
-            else:
-                print(f"无法从回复中提取JSON数据: {query}")
-                return None
+            return self._cache_info(query, self._extract_resume_info(query, response))
                 
         except Exception as e:
             print(f"处理简历查询失败: {e}")
             return None
     
+    async def process_resume_query_async(self, query: str, max_retries: int = 2,
+                                         platform: Optional[AsyncAiAgentPlatform] = None) -> Optional[Dict[str, Any]]:
+        """
+        异步处理简历查询并提取信息，限流（429）或服务端错误（5xx）时按指数退避重试
+        
+        Args:
+            query: 简历查询问题
+            max_retries: 最大重试次数
+            platform: 发送使用的异步客户端，默认使用对话API当前事件循环的客户端
+            
+        Returns:
+            extracted_info: 提取的简历信息字典
+        """
+        cached_info = self._get_cached_info(query)
+        if cached_info is not None:
+            return cached_info
+        
+        for attempt in range(max_retries + 1):
+            try:
+                response = await self.chat_api.send_message_async(query, platform)
+                return self._cache_info(query, self._extract_resume_info(query, response))
+            except Exception as e:
+                if attempt < max_retries and self._is_retryable(e):
+                    delay = 0.5 * 2 ** attempt
+                    print(f"查询失败，{delay} 秒后重试: {query}")
+                    await asyncio.sleep(delay)
+                    continue
+                print(f"处理简历查询失败: {e}")
+                return None
+    
+    def _get_cached_info(self, query: str) -> Optional[Dict[str, Any]]:
+        """查询缓存，未配置缓存或未命中时返回 None"""
+        if self.cache is None or self.bypass_cache:
+            return None
+        cached_info = self.cache.get(query, self._cache_scope)
+        if cached_info is not None:
+            print(f"命中缓存: {query}")
+        return cached_info
+    
+    def _cache_info(self, query: str, extracted_info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """缓存成功的提取结果并原样返回"""
+        if self.cache is not None and extracted_info:
+            self.cache.put(query, extracted_info, self._cache_scope)
+        return extracted_info
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """判断请求错误是否值得重试：限流、服务端错误、连接或超时错误"""
+        if isinstance(error, AiAgentPlatformAPIError):
+            return error.code is not None and (error.code == 429 or 500 <= error.code < 600)
+        # 与 aiagentplatformpy 一致，首次用到时才导入 aiohttp；其连接断开、响应体不完整等错误不继承内置的 ConnectionError
+        import aiohttp
+        
+        return isinstance(error, (ConnectionError, asyncio.TimeoutError, aiohttp.ClientError))
+    
+    def _extract_resume_info(self, query: str, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        从智能体回复中提取简历信息并补充查询信息
+        
+        Args:
+            query: 简历查询问题
+            response: send_message 返回的回复数据
+            
+        Returns:
+            extracted_info: 提取的简历信息字典
+        """
+        # 回复中不含任何关键字段名时，解析结果必然所有字段为空，跳过JSON解析
+        if not self._KEY_FIELDS_RE.search(response['answer']):
+            print(f"回复中没有任何简历字段: {query}")
+            return None
+        
+        # 提取JSON数据
+        extracted_info = self.extract_json_from_response(response['answer'])
+        
+        if extracted_info:
+            # 检查是否所有字段都为空
+            if self._is_all_fields_empty(extracted_info):
+                print(f"提取的JSON数据所有字段都为空: {query}")
+                return None
+            
+            # 添加查询信息
+            extracted_info['查询问题'] = query
+            extracted_info['对话ID'] = response['conversation_id']
+            extracted_info['时间戳'] = datetime.fromtimestamp(response['timestamp'] / 1e9).isoformat()
+            
+            return extracted_info
+        else:
+            print(f"无法从回复中提取JSON数据: {query}")
+            return None
+    
     def _is_all_fields_empty(self, data: Dict[str, Any]) -> bool:
         """
         检查数据中所有字段是否都为空
@@ -117,28 +352,11 @@ class ResumeExtractor:
         Returns:
             is_empty: 是否所有字段都为空
         """
-        # 需要检查的关键字段（排除系统添加的字段）
-        key_fields = [
-            '姓名', '性别', '最高学历', '硕士专业', '硕士院校', '硕士院校类别',
-            '本科院校', '本科院校类别', '本科专业', '成绩排名', '项目经历',
-            '项目经历关键词tag', '实习经历', '实习经历关键词tag', '硕士课题内容',
-            '课题内容关键词', '奖学金情况', '英语能力大学英语等级',
-            '英语能力托福和雅思及其分数', '编程语言', '加分项'
-        ]
-        
-        for field in key_fields:
-            if field in data:
-                value = data[field]
-                # 检查字段值是否为空
-                if isinstance(value, str) and value.strip():
-                    return False  # 有非空字符串值
-                elif isinstance(value, list) and value:
-                    return False  # 有非空列表值
-                elif value and str(value).strip():
-                    return False  # 有其他非空值
-        
-        # 所有关键字段都为空
-        return True
+        # 只检查记录中出现的关键字段，任一字段有非空值即返回 False
+        return not any(
+            value and (not isinstance(value, str) or value.strip())
+            for value in (data[field] for field in self._KEY_FIELDS.intersection(data))
+        )
     
     def batch_extract_resumes(self, queries: List[str]) -> List[Dict[str, Any]]:
         """
@@ -150,18 +368,23 @@ class ResumeExtractor:
         Returns:
             extracted_data: 提取的简历数据列表
         """
-        # 创建或加载对话
-        conversation_id = self.chat_api.create_or_load_conversation(use_existing=True)
+        # 创建或加载对话，已有对话时直接复用
+        conversation_id = self.chat_api.conversation_id or self.chat_api.create_or_load_conversation(use_existing=True)
         print(f"使用对话ID: {conversation_id}")
         
         extracted_data = []
         failed_queries = []  # 记录失败的查询
+        results_by_query: Dict[str, Optional[Dict[str, Any]]] = {}  # 重复的查询只请求一次
         
         for i, query in enumerate(queries, 1):
             print(f"\n=== 处理第{i}个简历查询 ===")
             print(f"查询: {query}")
             
-            extracted_info = self.process_resume_query(query)
+            if query in results_by_query:
+                print("重复查询，复用之前的结果")
+                extracted_info = results_by_query[query]
+            else:
+                extracted_info = results_by_query[query] = self.process_resume_query(query)
             
             if extracted_info:
                 extracted_data.append(extracted_info)
@@ -169,12 +392,59 @@ class ResumeExtractor:
             else:
                 print(f"❌ 提取简历信息失败")
                 # 记录失败的查询
-                failed_queries.append({
-                    '序号': i,
-                    '查询内容': query,
-                    '失败时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    '失败原因': '提取失败或无返回数据或所有字段为空'
-                })
+                failed_queries.append(self._failed_query_record(i, query))
+        
+        self.extracted_data = extracted_data
+        self.failed_queries = failed_queries  # 保存失败的查询列表
+        
+        # 如果有失败的查询，保存到文件
+        if failed_queries:
+            self.save_failed_queries()
+        
+        return extracted_data
+    
+    async def batch_extract_resumes_async(self, queries: List[str], max_concurrency: int = 8,
+                                          max_retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        并发批量提取简历信息，结果顺序与 queries 一致
+        
+        Args:
+            queries: 简历查询问题列表
+            max_concurrency: 同时进行中的请求数上限，按服务商的限流额度设置
+            max_retries: 单条查询在限流或服务端错误时的最大重试次数
+            
+        Returns:
+            extracted_data: 提取的简历数据列表
+        """
+        # 创建或加载对话，已有对话时直接复用
+        conversation_id = self.chat_api.conversation_id or self.chat_api.create_or_load_conversation(use_existing=True)
+        print(f"使用对话ID: {conversation_id}")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # 每次批量运行使用自己的异步客户端，结束时只关闭它，不影响其他线程或会话中的批量任务
+        platform = self.chat_api.create_async_platform()
+        
+        async def process(query: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.process_resume_query_async(query, max_retries, platform)
+        
+        # 重复的查询只请求一次，结果再按原顺序分发
+        unique_queries = list(dict.fromkeys(queries))
+        try:
+            results = await asyncio.gather(*[process(query) for query in unique_queries])
+        finally:
+            await platform.close()
+        results_by_query = dict(zip(unique_queries, results))
+        
+        extracted_data = []
+        failed_queries = []  # 记录失败的查询
+        for i, query in enumerate(queries, 1):
+            extracted_info = results_by_query[query]
+            if extracted_info:
+                extracted_data.append(extracted_info)
+            else:
+                failed_queries.append(self._failed_query_record(i, query))
+        print(f"✅ 成功提取 {len(extracted_data)} 条简历信息，❌ 失败 {len(failed_queries)} 条")
         
         self.extracted_data = extracted_data
         self.failed_queries = failed_queries  # 保存失败的查询列表
@@ -185,6 +455,44 @@ class ResumeExtractor:
         
         return extracted_data
     
+    @staticmethod
+    def _failed_query_record(index: int, query: str) -> Dict[str, Any]:
+        """构建失败查询记录"""
+        return {
+            '序号': index,
+            '查询内容': query,
+            '失败时间': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            '失败原因': '提取失败或无返回数据或所有字段为空'
+        }
+    
+    def _ordered_dataframe(self) -> pd.DataFrame:
+        """构建导出用的 DataFrame，重要字段排在前面"""
+        df = records_to_dataframe(self.extracted_data)
+        
+        # 重新排列列的顺序，将重要字段放在前面
+        important_columns = [
+            '姓名', '性别', '最高学历', '硕士专业', '硕士院校', '硕士院校类别',
+            '本科院校', '本科院校类别', '本科专业', '成绩排名', '英语能力大学英语等级',
+            '编程语言', '奖学金情况', '加分项'
+        ]
+        
+        # 获取所有列
+        all_columns = list(df.columns)
+        
+        # 重新排列列顺序
+        ordered_columns = []
+        for col in important_columns:
+            if col in all_columns:
+                ordered_columns.append(col)
+        
+        # 添加其他列
+        for col in all_columns:
+            if col not in ordered_columns:
+                ordered_columns.append(col)
+        
+        # 重新排列DataFrame
+        return df[ordered_columns]
+    
     def export_to_excel(self, filename: str = "resume_data.xlsx") -> bool:
         """
         将提取的简历数据导出到Excel
@@ -200,54 +508,8 @@ class ResumeExtractor:
             return False
         
         try:
-            # 创建DataFrame
-            df = pd.DataFrame(self.extracted_data)
-            
-            # 重新排列列的顺序，将重要字段放在前面
-            important_columns = [
-                '姓名', '性别', '最高学历', '硕士专业', '硕士院校', '硕士院校类别',
-                '本科院校', '本科院校类别', '本科专业', '成绩排名', '英语能力大学英语等级',
-                '编程语言', '奖学金情况', '加分项'
-            ]
-            
-            # 获取所有列
-            all_columns = list(df.columns)
-            
-            # 重新排列列顺序
-            ordered_columns = []
-            for col in important_columns:
-                if col in all_columns:
-                    ordered_columns.append(col)
-            
-            # 添加其他列
-            for col in all_columns:
-                if col not in ordered_columns:
-                    ordered_columns.append(col)
-            
-            # 重新排列DataFrame
-            df = df[ordered_columns]
-            
             # 导出到Excel
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='简历信息', index=False)
-                
-                # 获取工作表
-                worksheet = writer.sheets['简历信息']
-                
-                # 调整列宽
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)  # 最大宽度50
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            write_excel_sheet(filename, self._ordered_dataframe(), '简历信息')
             
             print(f"✅ 简历数据已导出到 {filename}")
             print(f"共导出 {len(self.extracted_data)} 条简历信息")
@@ -257,6 +519,38 @@ class ResumeExtractor:
             print(f"导出Excel失败: {e}")
             return False
     
+    def export_all(self, excel_filename: str = "resume_data.xlsx",
+                   json_filename: str = "resume_data.json") -> bool:
+        """
+        同时导出Excel和JSON，Excel序列化在子进程中进行，与JSON写出并行
+        
+        Args:
+            excel_filename: Excel输出文件名
+            json_filename: JSON输出文件名
+            
+        Returns:
+            success: 是否全部成功导出
+        """
+        if not self.extracted_data:
+            print("没有数据可以导出")
+            return False
+        
+        # openpyxl 的 XML 序列化受 GIL 限制，放到独立进程中才能与 JSON 写出重叠
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            excel_future = executor.submit(write_excel_sheet, excel_filename, self._ordered_dataframe(), '简历信息')
+            json_success = self.export_to_json(json_filename)
+            
+            try:
+                excel_future.result()
+                print(f"✅ 简历数据已导出到 {excel_filename}")
+                print(f"共导出 {len(self.extracted_data)} 条简历信息")
+                excel_success = True
+            except Exception as e:
+                print(f"导出Excel失败: {e}")
+                excel_success = False
+        
+        return excel_success and json_success
+    
     def export_to_json(self, filename: str = "resume_data.json") -> bool:
         """
         将提取的简历数据导出到JSON文件
@@ -272,8 +566,8 @@ class ResumeExtractor:
             return False
         
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.extracted_data, f, indent=2, ensure_ascii=False)
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(self.extracted_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             
             print(f"✅ 简历数据已导出到 {filename}")
             return True
@@ -322,29 +616,10 @@ class ResumeExtractor:
         
         try:
             # 创建DataFrame
-            df = pd.DataFrame(self.failed_queries)
+            df = records_to_dataframe(self.failed_queries)
             
             # 导出到Excel
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='失败查询', index=False)
-                
-                # 获取工作表
-                worksheet = writer.sheets['失败查询']
-                
-                # 调整列宽
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)  # 最大宽度50
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+            write_excel_sheet(filename, df, '失败查询')
             
             print(f"✅ 失败查询已保存到 {filename}")
             print(f"共保存 {len(self.failed_queries)} 条失败查询")
@@ -380,8 +655,8 @@ def main():
     base_url = 'https://aiagentplatform.cmft.com'
     user_id = 'Siga'
     
-    # 创建简历提取器
-    extractor = ResumeExtractor(api_key, base_url, user_id)
+    # 创建简历提取器；每条成功结果立即写入缓存，中断后重新运行会跳过已完成的查询
+    extractor = ResumeExtractor(api_key, base_url, user_id, cache=ResumeCache("resume_cache.db"))
     
     # 使用查询加载器
     query_loader = QueryLoader()
@@ -419,11 +694,8 @@ def main():
             print(f"成功提取数: {summary['successful_extractions']}")
             print(f"提取到的姓名: {summary['unique_names']}")
             
-            # 导出到Excel
-            extractor.export_to_excel("resume_data.xlsx")
-            
-            # 导出到JSON
-            extractor.export_to_json("resume_data.json")
+            # 导出到Excel和JSON
+            extractor.export_all("resume_data.xlsx", "resume_data.json")
             
             # 显示第一条数据示例
             if extracted_data:
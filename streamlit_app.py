@@ -1,14 +1,14 @@
+import asyncio
 import os
 import io
-import json
-import tempfile
 from datetime import datetime
 from typing import List
 
+import orjson
 import streamlit as st
 import pandas as pd
 
-from resume_extractor import ResumeExtractor
+from resume_extractor import ResumeCache, ResumeExtractor, records_to_dataframe, write_excel_sheet
 from query_loader import QueryLoader
 
 
@@ -29,43 +29,39 @@ def get_api_config():
 	return api_key, base_url, user_id
 
 
+@st.cache_resource
+def get_resume_cache() -> ResumeCache:
+	# 提取结果缓存在会话与重跑之间共享，有效期内重复的查询不再请求智能体
+	return ResumeCache()
+
+
+def get_extractor(api_key: str, base_url: str, user_id: str) -> ResumeExtractor:
+	# 提取器保存在会话状态中，重跑时复用已加载的对话与连接；提取结果等状态按会话隔离
+	key = (api_key, base_url, user_id)
+	if st.session_state.get('extractor_key') != key:
+		st.session_state['extractor'] = ResumeExtractor(api_key, base_url, user_id, cache=get_resume_cache())
+		st.session_state['extractor_key'] = key
+	return st.session_state['extractor']
+
+
 def strip_ext(filename: str) -> str:
-	if '.' not in filename:
-		return filename
-	return '.'.join(filename.split('.')[:-1])
+	return os.path.splitext(filename)[0]
 
 
 def to_excel_bytes(data: List[dict], sheet_name: str = '简历信息') -> bytes:
 	if not data:
 		return b''
-	df = pd.DataFrame(data)
 	output = io.BytesIO()
-	with pd.ExcelWriter(output, engine='openpyxl') as writer:
-		df.to_excel(writer, index=False, sheet_name=sheet_name)
-		ws = writer.sheets[sheet_name]
-		for column in ws.columns:
-			max_len = 0
-			col_letter = column[0].column_letter
-			for cell in column:
-				try:
-					val_len = len(str(cell.value)) if cell.value is not None else 0
-					max_len = max(max_len, val_len)
-				except Exception:
-					pass
-			ws.column_dimensions[col_letter].width = min(max_len + 2, 50)
-	output.seek(0)
-	return output.read()
+	write_excel_sheet(output, records_to_dataframe(data), sheet_name)
+	return output.getvalue()
 
 
 def to_failed_queries_excel_bytes(failed_queries: List[dict]) -> bytes:
 	if not failed_queries:
 		return b''
-	df = pd.DataFrame(failed_queries)
 	output = io.BytesIO()
-	with pd.ExcelWriter(output, engine='openpyxl') as writer:
-		df.to_excel(writer, index=False, sheet_name='失败查询')
-	output.seek(0)
-	return output.read()
+	write_excel_sheet(output, records_to_dataframe(failed_queries), '失败查询', adjust_width=False)
+	return output.getvalue()
 
 
 def main():
@@ -85,13 +81,9 @@ def main():
 		st.subheader('📁 上传查询文件（Excel/CSV/TXT）')
 		uploaded = st.file_uploader('选择一个包含查询列表的文件：', type=['xlsx', 'xls', 'csv', 'txt'])
 		if uploaded is not None:
-			# 将上传文件保存到临时文件，再复用现有 QueryLoader 逻辑
-			with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded.name.split('.')[-1]}") as tmp:
-				tmp.write(uploaded.read())
-				tmp_path = tmp.name
-			
+			# 直接从上传内容读取查询，无需先写入临时文件
 			loader = QueryLoader()
-			queries = loader.load_queries(tmp_path)
+			queries = loader.load_queries_from_bytes(uploaded.getvalue(), uploaded.name)
 			st.success(f'已读取 {len(queries)} 条查询')
 			if queries:
 				with st.expander('查看查询预览', expanded=False):
@@ -110,11 +102,14 @@ def main():
 	# ——— 开始提取 ———
 	st.divider()
 	can_run = bool(queries)
+	bypass_cache = st.checkbox('跳过缓存，重新向智能体查询（知识库中的简历有更新时使用）')
 	run = st.button('🚀 开始提取', disabled=not can_run)
 	if run:
 		with st.spinner('正在提取简历信息，请稍候...'):
-			extractor = ResumeExtractor(api_key, base_url, user_id)
-			data = extractor.batch_extract_resumes(queries)
+			extractor = get_extractor(api_key, base_url, user_id)
+			extractor.bypass_cache = bypass_cache
+			# 并发发送查询，结果顺序与查询列表一致
+			data = asyncio.run(extractor.batch_extract_resumes_async(queries))
 
 		if not data:
 			st.error('没有成功提取到任何简历数据')
@@ -131,14 +126,14 @@ def main():
 
 		# 数据预览
 		with st.expander('查看提取明细（前100行）', expanded=False):
-			st.dataframe(pd.DataFrame(data).head(100), use_container_width=True)
+			st.dataframe(records_to_dataframe(data[:100]), use_container_width=True)
 
 		# 下载区
 		st.subheader('📥 下载结果文件')
 		excel_bytes = to_excel_bytes(data, sheet_name='简历信息')
-		json_str = json.dumps(data, ensure_ascii=False, indent=2)
+		json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 		st.download_button('📊 下载Excel', data=excel_bytes, file_name=f"resume_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-		st.download_button('📄 下载JSON', data=json_str.encode('utf-8'), file_name=f"resume_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", mime='application/json')
+		st.download_button('📄 下载JSON', data=json_bytes, file_name=f"resume_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", mime='application/json')
 
 		# 失败查询
 		failed = getattr(extractor, 'failed_queries', [])